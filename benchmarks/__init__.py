@@ -0,0 +1,2 @@
+# Benchmarks, run from the repository root, e.g.:
+#   python -m benchmarks.dispatch
@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+
+from core.batch import BatchCore
+from headless import make_core
+
+STEPS = 2_000
+INSTANCES = (1, 64, 1024, 4096)
+
+# ALU loop that draws a digit every pass. V4 is seeded per instance so the
+# skip at 0x20E takes different paths and the machines drift out of lockstep.
+DRAW_ROM = bytes([
+    0x60, 0x00,  # 0x200: LD V0, 00
+    0x61, 0x05,  # 0x202: LD V1, 05
+    0x70, 0x01,  # 0x204: ADD V0, 01
+    0x80, 0x14,  # 0x206: ADD V0, V1
+    0x82, 0x02,  # 0x208: AND V2, V0
+    0xF2, 0x29,  # 0x20A: LD F, V2
+    0xD0, 0x15,  # 0x20C: DRW V0, V1, 5
+    0x34, 0x00,  # 0x20E: SE V4, 00
+    0x74, 0xFF,  # 0x210: ADD V4, FF
+    0x12, 0x04,  # 0x212: JP 204
+])
+
+
+def measure_core(steps: int = STEPS) -> float:
+    core = make_core("translate")
+    core.write_rom(DRAW_ROM)
+    start = time.perf_counter()
+    executed = core.run(steps * 50)
+    return executed / (time.perf_counter() - start)
+
+
+def measure_batch(instances: int, steps: int = STEPS) -> float:
+    batch = BatchCore(instances, seed=0)
+    batch.load_rom(DRAW_ROM)
+    batch.v[:, 4] = np.arange(instances) % 7
+    start = time.perf_counter()
+    executed = batch.run(steps)
+    return executed / (time.perf_counter() - start)
+
+
+def main() -> None:
+    baseline = measure_core()
+    print(f"{'Core (translate)':<22} {baseline:12,.0f} instructions/sec   1.00x")
+    for instances in INSTANCES:
+        ips = measure_batch(instances)
+        print(f"{f'BatchCore x{instances}':<22} {ips:12,.0f} instructions/sec  {ips / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import time
+
+from core.memory import Memory
+from core.decoder import Decoder
+from core.core import Core
+from peripherals.display import Display
+from peripherals.keyboard import Keyboard
+
+CYCLES = 200_000
+FRAME_BUDGETS = (8, 1000) # instructions per frame: 500 Hz and an uncapped headless run
+
+# Tight ALU / skip / jump loop, no drawing.
+LOOP_ROM = bytes([
+    0x60, 0x00,  # 0x200: LD V0, 00
+    0x61, 0x05,  # 0x202: LD V1, 05
+    0x70, 0x01,  # 0x204: ADD V0, 01
+    0x80, 0x14,  # 0x206: ADD V0, V1
+    0x82, 0x02,  # 0x208: AND V2, V0
+    0xA3, 0x00,  # 0x20A: LD I, 300
+    0x30, 0x00,  # 0x20C: SE V0, 00
+    0x41, 0x01,  # 0x20E: SNE V1, 01
+    0x63, 0x00,  # 0x210: LD V3, 00
+    0xF0, 0x1E,  # 0x212: ADD I, V0
+    0x12, 0x04,  # 0x214: JP 204
+])
+
+
+MODES = ("decoder", "table", "translate")
+
+
+def make_core(mode: str, history: int = 10) -> Core:
+    memory = Memory()
+    core = Core(memory, Decoder(), Keyboard(), Display(64, 32, 1, None))
+    core.write_rom(LOOP_ROM)
+    core._is_rom_loaded = True
+    core.select_dispatch(mode)
+    core.set_history_depth(history)
+    return core
+
+
+def measure(mode: str, history: int = 10, cycles: int = CYCLES) -> float:
+    core = make_core(mode, history)
+    start = time.perf_counter()
+    executed = core.run(cycles)
+    return executed / (time.perf_counter() - start)
+
+
+def measure_frames(mode: str, cycles_per_frame: int, history: int = 10, cycles: int = CYCLES) -> float:
+    """Like measure(), but through headless.run_frames: run(cycles_per_frame) and a timer tick per frame."""
+    # null frontend, a raylib Keyboard would dominate the per-frame cost
+    import headless
+
+    core = headless.make_core(mode, history)
+    core.write_rom(LOOP_ROM)
+    core._is_rom_loaded = True
+    run_frames = headless.run_frames
+    start = time.perf_counter()
+    executed, _, _ = run_frames(core, cycles=cycles, cycles_per_frame=cycles_per_frame)
+    return executed / (time.perf_counter() - start)
+
+
+def main() -> None:
+    baseline = None
+    for mode in MODES:
+        ips = measure(mode)
+        baseline = baseline or ips
+        print(f"{mode:<22} {ips:12,.0f} instructions/sec  {ips / baseline:5.2f}x")
+    for mode in MODES[1:]:
+        ips = measure(mode, history=0)
+        print(f"{mode + ' (no history)':<22} {ips:12,.0f} instructions/sec  {ips / baseline:5.2f}x")
+    for budget in FRAME_BUDGETS:
+        print(f"\nrun_frames, {budget} instructions per frame")
+        table = None
+        for mode in MODES[1:]:
+            ips = measure_frames(mode, budget)
+            table = table or ips
+            print(f"{mode:<22} {ips:12,.0f} instructions/sec  {ips / table:5.2f}x table")
+
+
+if __name__ == "__main__":
+    main()
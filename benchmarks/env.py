@@ -0,0 +1,40 @@
+import time
+import tracemalloc
+
+from benchmarks.batch import DRAW_ROM
+from env import Chip8Env
+
+STEPS = 5_000
+FRAME_SKIPS = (1, 4)
+
+
+def measure(frame_skip: int, steps: int = STEPS) -> tuple:
+    """Returns (seconds per step, bytes still allocated after `steps` steps)."""
+    env = Chip8Env(DRAW_ROM, frame_skip=frame_skip)
+    env.reset()
+    for action in range(100):  # warm up the translator's block cache
+        env.step(action)
+
+    start = time.perf_counter()
+    for action in range(steps):
+        env.step(action & 0xFFFF)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for action in range(steps):
+        env.step(action & 0xFFFF)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    leaked = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return elapsed / steps, leaked
+
+
+def main() -> None:
+    for frame_skip in FRAME_SKIPS:
+        latency, leaked = measure(frame_skip)
+        print(f"frame_skip={frame_skip}  {latency * 1e6:8.1f} us/step  {leaked:6d} bytes retained over {STEPS} steps")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import timeit
+
+import numpy as np
+
+from core.memory import Memory
+from core.decoder import Decoder
+from core.core import Core
+from peripherals.display import Display
+from peripherals.keyboard import Keyboard
+
+NUMBER = 100_000
+
+# One representative opcode per handler family, dispatched through the opcode table.
+OPCODES = {
+    "6xkk LD Vx, byte": 0x6A12,
+    "7xkk ADD Vx, byte": 0x7AF0,
+    "8xy0 LD Vx, Vy": 0x8AB0,
+    "8xy4 ADD Vx, Vy": 0x8AB4,
+    "8xy5 SUB Vx, Vy": 0x8AB5,
+    "8xyE SHL Vx": 0x8ABE,
+    "3xkk SE Vx, byte": 0x3A12,
+    "9xy0 SNE Vx, Vy": 0x9AB0,
+    "Fx07 LD Vx, DT": 0xFA07,
+    "Fx1E ADD I, Vx": 0xFA1E,
+    "Fx33 LD B, Vx": 0xFA33,
+}
+
+
+def make_core(use_numpy: bool) -> Core:
+    core = Core(Memory(), Decoder(), Keyboard(), Display(64, 32, 1, None))
+    if use_numpy:
+        # The register file as it used to be.
+        core._v = np.array([0] * 16, dtype=np.uint8)
+        core._stack = np.array([0] * 16, dtype=np.uint16)
+        core._i = np.uint16(0x300)
+        core._dt = np.uint8(0x20)
+    else:
+        core._i = 0x300
+        core._dt = 0x20
+    core._v[0xA] = 0xC8
+    core._v[0xB] = 0x64
+    return core
+
+
+def measure(use_numpy: bool, opcode: int) -> float:
+    core = make_core(use_numpy)
+    handler, operands = core._opcode_table[opcode]
+
+    def step() -> None:
+        core._pc = 0x200
+        handler(core, *operands)
+
+    with np.errstate(over="ignore"):
+        return timeit.timeit(step, number=NUMBER) / NUMBER * 1e9
+
+
+def main() -> None:
+    print(f"{'opcode':<20} {'numpy ns':>10} {'plain ns':>10} {'speedup':>8}")
+    for name, opcode in OPCODES.items():
+        numpy_ns = measure(True, opcode)
+        plain_ns = measure(False, opcode)
+        print(f"{name:<20} {numpy_ns:10.1f} {plain_ns:10.1f} {numpy_ns / plain_ns:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
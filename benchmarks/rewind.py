@@ -0,0 +1,39 @@
+import time
+
+from benchmarks.batch import DRAW_ROM
+from core.rewind import Rewind
+from headless import make_core, CHIP8_CLOCK_HZ, TARGET_FPS
+
+FRAMES = TARGET_FPS * 60
+STATE_SIZE = len(make_core().save_state())
+
+
+def main() -> None:
+    core = make_core("translate")
+    core.write_rom(DRAW_ROM)
+    rewind = Rewind(core, keyframe_interval=TARGET_FPS, max_bytes=1 << 30)
+
+    recording = 0.0
+    for _ in range(FRAMES):
+        core.run(CHIP8_CLOCK_HZ // TARGET_FPS)
+        core.update_timer()
+        start = time.perf_counter()
+        rewind.record()
+        recording += time.perf_counter() - start
+
+    frames = len(rewind)
+    size = rewind.size
+    start = time.perf_counter()
+    while rewind.step_back():
+        pass
+    stepping = time.perf_counter() - start
+
+    print(f"frames recorded:  {frames} ({frames / TARGET_FPS:.0f} s of gameplay)")
+    print(f"buffer size:      {size / 1024:,.1f} KB, {size / frames:.0f} bytes/frame "
+          f"({STATE_SIZE} bytes uncompressed)")
+    print(f"record:           {recording / frames * 1e6:.1f} us/frame")
+    print(f"step back:        {stepping / (frames - 1) * 1e6:.1f} us/frame")
+
+
+if __name__ == "__main__":
+    main()
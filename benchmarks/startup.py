@@ -0,0 +1,47 @@
+import statistics
+import subprocess
+import sys
+import time
+
+from peripherals.backends import FRONTENDS
+
+RUNS = 5
+
+# Runs in a fresh interpreter, prints the seconds spent importing and creating the frontend.
+SNIPPET = """
+import time
+start = time.perf_counter()
+from core.memory import Memory
+from core.decoder import Decoder
+from core.core import Core
+from peripherals.backends import create_frontend
+display, keyboard = create_frontend({name!r}, 64, 32)
+Core(Memory(), Decoder(), keyboard, display)
+print(time.perf_counter() - start)
+"""
+
+
+def cold_start(name: str) -> tuple:
+    """Returns (seconds inside the interpreter, seconds for the whole process)."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", SNIPPET.format(name=name)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    process = time.perf_counter() - start
+    return float(result.stdout.strip().splitlines()[-1]), process
+
+
+def main() -> None:
+    print(f"{'frontend':<10} {'import+create ms':>17} {'process ms':>11}")
+    for name in FRONTENDS:
+        runs = [cold_start(name) for _ in range(RUNS)]
+        inside = statistics.median(run[0] for run in runs) * 1000
+        process = statistics.median(run[1] for run in runs) * 1000
+        print(f"{name:<10} {inside:17.1f} {process:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
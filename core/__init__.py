@@ -1,3 +1,8 @@
 from . import core
 from . import decoder
-from . import memory
\ No newline at end of file
+from . import history
+from . import library
+from . import memory
+from . import profiler
+from . import scheduler
+from . import translator
\ No newline at end of file
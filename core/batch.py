@@ -0,0 +1,341 @@
+import numpy as np
+
+from peripherals.framebuffer import SPRITE_BITS
+
+from .memory import Memory
+
+_SPRITE_COLUMNS = np.arange(8)
+
+
+class BatchCore:
+    """N CHIP-8 machines stepped in lockstep with NumPy.
+
+    Every piece of machine state is stacked along the first axis: registers (N, 16),
+    memory (N, 4096), framebuffers (N, height, width), and PC, I, SP and the timers
+    as (N,) vectors. step() fetches one opcode per machine, groups the machines by
+    the opcode's top nibble and applies each group's handler as one masked vector
+    operation. Handlers follow Core's, with these differences:
+
+    * random bytes come from NumPy's generator, not the random module
+    * a call past the top of the stack, or a read/write outside memory, fails the
+      machine with a message instead of raising
+    * Ex9E / ExA1 with Vx > 0xF count the key as not pressed
+    """
+    MAX_STACK_DEPTH: int = 15
+
+    def __init__(self, instances: int, x_axis: int = 64, y_axis: int = 32, seed: int | None = None) -> None:
+        self.instances: int = instances
+        self.x_axis: int = x_axis
+        self.y_axis: int = y_axis
+        self.memory: np.ndarray = np.zeros((instances, 4096), dtype=np.uint8)
+        self.v: np.ndarray = np.zeros((instances, 16), dtype=np.uint8)
+        self.pc: np.ndarray = np.zeros(instances, dtype=np.int32)
+        self.i: np.ndarray = np.zeros(instances, dtype=np.int32)
+        self.stack: np.ndarray = np.zeros((instances, 16), dtype=np.int32)
+        self.sp: np.ndarray = np.zeros(instances, dtype=np.int32)
+        self.dt: np.ndarray = np.zeros(instances, dtype=np.int32)
+        self.st: np.ndarray = np.zeros(instances, dtype=np.int32)
+        self.pixels: np.ndarray = np.zeros((instances, y_axis, x_axis), dtype=bool) # pixels[n, y, x]
+        self.keys: np.ndarray = np.zeros((instances, 16), dtype=bool)
+        self.waiting: np.ndarray = np.zeros(instances, dtype=bool) # blocked on Fx0A
+        self.wait_reg: np.ndarray = np.zeros(instances, dtype=np.int32)
+        self.failed: np.ndarray = np.zeros(instances, dtype=bool)
+        self.exceptions: list = [""] * instances
+        self.executed: int = 0 # instructions executed over all machines
+
+        # CHIP-48 Mode
+        self.shift_use_vy: bool = False
+        self.increment_i: bool = False
+
+        self._rng = np.random.default_rng(seed)
+        self._font = np.frombuffer(bytes(Memory()[0:80]), dtype=np.uint8)
+        self._handlers = (
+            self._op_0, self._op_1, self._op_2, self._op_3,
+            self._op_4, self._op_5, self._op_6, self._op_7,
+            self._op_8, self._op_9, self._op_a, self._op_b,
+            self._op_c, self._op_d, self._op_e, self._op_f,
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        self.memory.fill(0)
+        self.memory[:, :len(self._font)] = self._font
+        self.v.fill(0)
+        self.pc.fill(0x200)
+        self.i.fill(0)
+        self.stack.fill(0)
+        self.sp.fill(-1)
+        self.dt.fill(0)
+        self.st.fill(0)
+        self.pixels.fill(False)
+        self.keys.fill(False)
+        self.waiting.fill(False)
+        self.wait_reg.fill(0)
+        self.failed.fill(False)
+        self.exceptions = [""] * self.instances
+        self.executed = 0
+
+    def load_rom(self, rom: bytes, instances: object = slice(None)) -> None:
+        """Copy a ROM to 0x200 of every machine, or of the machines selected by `instances`."""
+        if len(rom) > 0x1000 - 0x200:
+            raise ValueError(f"ROM is {len(rom)} bytes, at most {0x1000 - 0x200} fit from 0x200")
+        self.memory[instances, 0x200:0x200 + len(rom)] = np.frombuffer(rom, dtype=np.uint8)
+
+    def resume_with_key(self, key: int, instances: object = slice(None)) -> None:
+        """Finish a pending Fx0A wait with `key` on the selected machines that are waiting."""
+        selected = np.zeros(self.instances, dtype=bool)
+        selected[instances] = True
+        j = np.nonzero(selected & self.waiting)[0]
+        self.v[j, self.wait_reg[j]] = key
+        self.waiting[j] = False
+        self.pc[j] += 2
+
+    def update_timer(self) -> None:
+        """Decrements the delay and sound timers of every machine."""
+        np.subtract(self.dt, 1, out=self.dt, where=self.dt > 0)
+        np.subtract(self.st, 1, out=self.st, where=self.st > 0)
+
+    def run(self, steps: int) -> int:
+        """Step every machine `steps` times, returns the instructions executed."""
+        executed = 0
+        for _ in range(steps):
+            executed += self.step()
+        return executed
+
+    def step(self) -> int:
+        """Execute one instruction on every machine that is not waiting or failed."""
+        active = np.nonzero(~(self.waiting | self.failed))[0]
+        if not active.size:
+            return 0
+        pc = self.pc[active]
+        outside = pc >= 0xFFF
+        if outside.any():
+            self._fail(active[outside], lambda n: f"Runtime Error: PC out of memory (PC: {hex(self.pc[n])})")
+            active = active[~outside]
+            pc = pc[~outside]
+            if not active.size:
+                return 0
+
+        opcodes = self.memory[active, pc].astype(np.int32) << 8 | self.memory[active, pc + 1]
+        nibbles = opcodes >> 12
+        if (nibbles == nibbles[0]).all():
+            # machines running the same ROM are often in lockstep, skip the sort
+            self._handlers[nibbles[0]](active, opcodes)
+        else:
+            order = np.argsort(nibbles, kind="stable")
+            bounds = np.flatnonzero(np.diff(nibbles[order])) + 1
+            for group in np.split(order, bounds):
+                self._handlers[nibbles[group[0]]](active[group], opcodes[group])
+        self.executed += active.size
+        return active.size
+
+    def _fail(self, j: np.ndarray, message: object) -> None:
+        self.failed[j] = True
+        for n in j.tolist():
+            self.exceptions[n] = message(n)
+
+    def _op_0(self, j: np.ndarray, op: np.ndarray) -> None:
+        cls = op == 0x00E0
+        if cls.any():
+            jc = j[cls]
+            self.pixels[jc] = False
+            self.pc[jc] += 2
+
+        ret = op == 0x00EE
+        if ret.any():
+            jr = j[ret]
+            under = self.sp[jr] < 0
+            if under.any():
+                self._fail(
+                    jr[under],
+                    lambda n: f"Runtime Error: Stack Underflow! (PC: {hex(self.pc[n])}, SP: {self.sp[n]})",
+                )
+                jr = jr[~under]
+            sp = self.sp[jr]
+            self.pc[jr] = self.stack[jr, sp]
+            self.stack[jr, sp] = 0
+            self.sp[jr] -= 1
+        # 0NNN (SYS addr) is ignored, same as Core
+
+    def _op_1(self, j: np.ndarray, op: np.ndarray) -> None:
+        self.pc[j] = op & 0x0FFF
+
+    def _op_2(self, j: np.ndarray, op: np.ndarray) -> None:
+        over = self.sp[j] >= self.MAX_STACK_DEPTH
+        if over.any():
+            self._fail(
+                j[over],
+                lambda n: f"Runtime Error: Stack Overflow! (PC: {hex(self.pc[n])}, SP: {self.sp[n]})",
+            )
+            j = j[~over]
+            op = op[~over]
+        self.sp[j] += 1
+        self.stack[j, self.sp[j]] = self.pc[j]
+        self.pc[j] = op & 0x0FFF
+
+    def _op_3(self, j: np.ndarray, op: np.ndarray) -> None:
+        self.pc[j] += np.where(self.v[j, op >> 8 & 0x0F] == (op & 0xFF), 4, 2)
+
+    def _op_4(self, j: np.ndarray, op: np.ndarray) -> None:
+        self.pc[j] += np.where(self.v[j, op >> 8 & 0x0F] != (op & 0xFF), 4, 2)
+
+    def _op_5(self, j: np.ndarray, op: np.ndarray) -> None:
+        self.pc[j] += np.where(self.v[j, op >> 8 & 0x0F] == self.v[j, op >> 4 & 0x0F], 4, 2)
+
+    def _op_6(self, j: np.ndarray, op: np.ndarray) -> None:
+        self.v[j, op >> 8 & 0x0F] = op & 0xFF
+        self.pc[j] += 2
+
+    def _op_7(self, j: np.ndarray, op: np.ndarray) -> None:
+        x = op >> 8 & 0x0F
+        self.v[j, x] = (self.v[j, x] + (op & 0xFF)) & 0xFF
+        self.pc[j] += 2
+
+    def _op_8(self, j: np.ndarray, op: np.ndarray) -> None:
+        v = self.v
+        n = op & 0x0F
+        for sub in np.unique(n).tolist():
+            sel = n == sub
+            js = j[sel]
+            x = op[sel] >> 8 & 0x0F
+            y = op[sel] >> 4 & 0x0F
+            # VF is written before Vx and Vx is read again afterwards, like Core does
+            if sub == 0x0:
+                v[js, x] = v[js, y]
+            elif sub == 0x1:
+                v[js, x] = v[js, x] | v[js, y]
+            elif sub == 0x2:
+                v[js, x] = v[js, x] & v[js, y]
+            elif sub == 0x3:
+                v[js, x] = v[js, x] ^ v[js, y]
+            elif sub == 0x4:
+                add = v[js, x].astype(np.int32) + v[js, y]
+                v[js, 0xF] = add > 0xFF
+                v[js, x] = add & 0xFF
+            elif sub == 0x5:
+                v[js, 0xF] = v[js, x] >= v[js, y]
+                v[js, x] = (v[js, x].astype(np.int32) - v[js, y]) & 0xFF
+            elif sub == 0x6:
+                source = y if self.shift_use_vy else x
+                v[js, 0xF] = v[js, source] & 1
+                v[js, x] = v[js, source] >> 1
+            elif sub == 0x7:
+                v[js, 0xF] = v[js, y] >= v[js, x]
+                v[js, x] = (v[js, y].astype(np.int32) - v[js, x]) & 0xFF
+            elif sub == 0xE:
+                source = y if self.shift_use_vy else x
+                v[js, 0xF] = (v[js, source] & 0x80) >> 7
+                v[js, x] = (v[js, source].astype(np.int32) << 1) & 0xFF
+            else:
+                codes = dict(zip(js.tolist(), op[sel].tolist()))
+                self._fail(js, lambda m: f"Unkown 8XYN opcode {codes[m]:04X}")
+                continue
+            self.pc[js] += 2
+
+    def _op_9(self, j: np.ndarray, op: np.ndarray) -> None:
+        self.pc[j] += np.where(self.v[j, op >> 8 & 0x0F] != self.v[j, op >> 4 & 0x0F], 4, 2)
+
+    def _op_a(self, j: np.ndarray, op: np.ndarray) -> None:
+        self.i[j] = op & 0x0FFF
+        self.pc[j] += 2
+
+    def _op_b(self, j: np.ndarray, op: np.ndarray) -> None:
+        self.pc[j] = (op & 0x0FFF) + self.v[j, 0]
+
+    def _op_c(self, j: np.ndarray, op: np.ndarray) -> None:
+        self.v[j, op >> 8 & 0x0F] = self._rng.integers(0, 256, j.size) & (op & 0xFF)
+        self.pc[j] += 2
+
+    def _op_d(self, j: np.ndarray, op: np.ndarray) -> None:
+        """Draw every sprite one row at a time, all machines at once, wrapping at the edges."""
+        x = self.v[j, op >> 8 & 0x0F].astype(np.int32) % self.x_axis
+        y = self.v[j, op >> 4 & 0x0F].astype(np.int32) % self.y_axis
+        height = op & 0x0F
+        i = self.i[j]
+        columns = (x[:, None] + _SPRITE_COLUMNS) % self.x_axis
+        collision = np.zeros(j.size, dtype=bool)
+        for row in range(int(height.max(initial=0))):
+            # sprites that still have this row, reads past the end of memory are dropped like a short slice
+            drawing = (height > row) & (i + row < 0x1000)
+            if not drawing.any():
+                continue
+            jd = j[drawing]
+            bits = SPRITE_BITS[self.memory[jd, i[drawing] + row]]
+            rows = ((y[drawing] + row) % self.y_axis)[:, None]
+            cols = columns[drawing]
+            target = self.pixels[jd[:, None], rows, cols]
+            collision[drawing] |= (target & bits).any(axis=1)
+            self.pixels[jd[:, None], rows, cols] = target ^ bits
+        self.v[j, 0xF] = collision
+        self.pc[j] += 2
+
+    def _op_e(self, j: np.ndarray, op: np.ndarray) -> None:
+        kk = op & 0xFF
+        known = (kk == 0x9E) | (kk == 0xA1)
+        if not known.all():
+            codes = dict(zip(j[~known].tolist(), op[~known].tolist()))
+            self._fail(j[~known], lambda m: f"Unknown EXNN opcode {codes[m]:04X}")
+            j = j[known]
+            op = op[known]
+            kk = kk[known]
+        key = self.v[j, op >> 8 & 0x0F]
+        pressed = (key < 16) & self.keys[j, key & 0x0F]
+        skip = np.where(kk == 0x9E, pressed, ~pressed)
+        self.pc[j] += np.where(skip, 4, 2)
+
+    def _op_f(self, j: np.ndarray, op: np.ndarray) -> None:
+        v = self.v
+        kk = op & 0xFF
+        for sub in np.unique(kk).tolist():
+            sel = kk == sub
+            js = j[sel]
+            x = op[sel] >> 8 & 0x0F
+            if sub == 0x07:
+                v[js, x] = self.dt[js]
+            elif sub == 0x0A:
+                self.waiting[js] = True
+                self.wait_reg[js] = x
+                continue
+            elif sub == 0x15:
+                self.dt[js] = v[js, x]
+            elif sub == 0x18:
+                self.st[js] = v[js, x]
+            elif sub == 0x1E:
+                add = self.i[js] + v[js, x]
+                v[js, 0xF] = add > 0xFFF
+                self.i[js] = add & 0x0FFF
+            elif sub == 0x29:
+                self.i[js] = (v[js, x].astype(np.int32) * 5) & 0x0FFF
+            elif sub in (0x33, 0x55, 0x65):
+                count = np.full(js.size, 3) if sub == 0x33 else x + 1
+                outside = self.i[js] + count > 0x1000
+                if outside.any():
+                    self._fail(
+                        js[outside],
+                        lambda n: f"Runtime Error: memory access out of range (I: {hex(self.i[n])})",
+                    )
+                    js = js[~outside]
+                    x = x[~outside]
+                i = self.i[js]
+                if sub == 0x33:
+                    value = v[js, x]
+                    self.memory[js, i] = value // 100
+                    self.memory[js, i + 1] = (value % 100) // 10
+                    self.memory[js, i + 2] = value % 10
+                else:
+                    for register in range(16):
+                        copying = x >= register
+                        if not copying.any():
+                            break
+                        jc = js[copying]
+                        if sub == 0x55:
+                            self.memory[jc, i[copying] + register] = v[jc, register]
+                        else:
+                            v[jc, register] = self.memory[jc, i[copying] + register]
+                    if self.increment_i:  # COSMAC VIP style
+                        self.i[js] += x + 1
+            else:
+                codes = dict(zip(js.tolist(), op[sel].tolist()))
+                self._fail(js, lambda m: f"Unknown FXNN opcode {hex(codes[m])}")
+                continue
+            self.pc[js] += 2
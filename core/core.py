@@ -1,24 +1,41 @@
 import os
-import binascii
 import random
+import struct
 
-import numpy as np
+from .history import OpcodeHistory
+from .library import RomLibrary
+from .translator import Translator
+
+# Save state layout (little endian): this header, then the 4 KB of memory, then the
+# framebuffer rows packed 8 pixels per byte. Bump STATE_VERSION whenever it changes.
+STATE_MAGIC = b"C8SS"
+STATE_VERSION = 1
+# magic, version, PC, I, SP, DT, ST, waiting for key, key register, screen width, height, V0-VF, stack
+_STATE_HEADER = struct.Struct("<4sBHHbBB?BHH16s16H")
+MEMORY_SIZE = 0x1000
+ROM_START = 0x200
+ROM_SIZE = MEMORY_SIZE - ROM_START
 
 
 class Core:
+    # opcode -> (handler, operands), see _build_opcode_table()
+    _opcode_table: list | None = None
+
     def __init__(self, memory: object, decoder: object, keyboard: object, display: object) -> None:
         # initialize
         # Usually from  0X000 to 0X1FF Reserved for interpreter but not for this one.
         # 0X050 to 0X0A0 for builtin characters from 0 to F
         # 0X200 to 0XFFF for Instructions
-        self._v: np.ndarray = np.array([0] * 16,dtype=np.uint8)  # initial 16 8-bit registers from V0 to VF
+        # Plain ints everywhere, handlers mask explicitly to get the 8/12-bit wraparound.
+        self._v: bytearray = bytearray(16)  # initial 16 8-bit registers from V0 to VF
         self._pc: int = 0X200 # Program counter start at the address off 0X200, 16-bit register.
-        self._i: np.uint16 = 0x0 # 12-bit index register
-        self._stack: np.ndarray = np.array([0] * 16, dtype=np.uint16) # 16 level of stack
+        self._i: int = 0x0 # 12-bit index register
+        self._stack: list = [0] * 16 # 16 level of stack
         self._sp: int = -1 # stack pointer 0XFF
-        self._dt: np.uint8 = 0x0 # 8-bit register delay timer
-        self._st: np.uint8  = 0x0 # 8-bit register sound timer
+        self._dt: int = 0x0 # 8-bit register delay timer
+        self._st: int  = 0x0 # 8-bit register sound timer
         self.memory: object = memory
+        self._ram: memoryview = memory.buffer # reads only, writes go through memory[...]
         self.decoder: object = decoder
         self.keyboard: object = keyboard
         self.display: object = display
@@ -26,9 +43,12 @@ class Core:
         self._pressed_key: int = 0
         self._exceptions: str = ""
         self._is_exceptions: bool = False
-        self._opcode_history: list = []
         self.MAX_HISTORY_LENGTH: int = 10
+        self.history: OpcodeHistory | None = OpcodeHistory(self.MAX_HISTORY_LENGTH) # None when recording is off
         self._is_rom_loaded: int = False
+        self.library: RomLibrary | None = None # set by read_rom()
+        self.skip_idle: bool = True # run() fast-forwards idle loops, see _skip_idle_loop()
+        self._not_idle: set = set() # loop starts already found not to be idle
         self.MAX_STACK_DEPTH = 15
         
         # CHIP-48 Mode
@@ -38,21 +58,28 @@ class Core:
         # SCHIP
         # TODO: Add variables to handle SCHIP later
 
+        # Dispatch: the opcode table is shared by every Core and built on first use.
+        if Core._opcode_table is None:
+            Core._opcode_table = Core._build_opcode_table()
+        self.translator: Translator | None = None
+        self.dispatch_mode: str = "table"
+        self.select_dispatch("table")
 
     def reset(self) -> None:
-        self._v: np.ndarray = np.array([0] * 16,dtype=np.uint8)
+        self._v: bytearray = bytearray(16)
         self._pc: int = 0X200 
-        self._i: np.uint16 = 0x0
-        self._stack: np.ndarray = np.array([0] * 16, dtype=np.uint16) 
+        self._i: int = 0x0
+        self._stack: list = [0] * 16
         self._sp: int = -1 
-        self._dt: np.uint8 = 0x0 
-        self._st: np.uint8  = 0x0
+        self._dt: int = 0x0 
+        self._st: int  = 0x0
         self._is_waiting_key: bool = False
         self._pressed_key: int = 0
         self._exceptions: str = ""
         self._is_exceptions: bool = False
-        self._opcode_history: list = []
-        self.MAX_HISTORY_LENGTH: int = 10
+        if self.history is not None:
+            self.history.clear()
+        self._not_idle.clear()
         self._is_rom_loaded: int = False
         
     def read_path(self) -> str:
@@ -60,39 +87,276 @@ class Core:
             return os.path.join(abspath, "GAMES/")
 
     def read_rom(self) -> tuple:
-        rom_path = self.read_path()
-        all_entries = sorted(os.listdir(rom_path))
+        self.library = RomLibrary(self.read_path())
+        self.library.refresh()
+        all_entries = self.library.names()
         roms = []
         for entry in range(0, len(all_entries), 6):
             sub_list = all_entries[entry:entry + 6]
             roms.append(sub_list)
         return roms, len(max(all_entries, key=len))
     
-    def write_rom(self, game: str) -> None:
-        path = self.read_path()
-        with open(os.path.join(path, game), "rb") as file:
-            start = self._pc
-            _next = 0
-            rom = binascii.hexlify(file.read()).decode('utf-8')
-            while True:
-                if _next >= len(rom):
-                    break
-                data = f"0x{rom[_next: _next + 2]}"
-                self.memory[start] = int(data, 16)
-                start += 1 
-                _next += 2
-        
+    def write_rom(self, game: str | bytes) -> None:
+        """Copy a ROM to 0x200. `game` is a path relative to GAMES/ (an absolute path is used as is), or the ROM bytes.
+        Raises ValueError if it does not fit below 0x1000.
+        """
+        if isinstance(game, str):
+            with open(os.path.join(self.read_path(), game), "rb") as file:
+                # one byte more than fits, so an oversized file is caught without reading all of it
+                rom = file.read(ROM_SIZE + 1)
+        else:
+            rom = game
+        if len(rom) > ROM_SIZE:
+            size = "more than " + str(ROM_SIZE) if isinstance(game, str) else str(len(rom))
+            raise ValueError(
+                f"ROM is {size} bytes, only {ROM_SIZE} fit between 0x{ROM_START:03X} and 0x{MEMORY_SIZE - 1:03X}"
+            )
+        self.memory[ROM_START:ROM_START + len(rom)] = rom
+        self._not_idle.clear()
+
+    def apply_rom_settings(self, game: str) -> int:
+        """Set the quirk flags the library suggests for `game`, returns its suggested clock in Hz."""
+        info = self.library.info(game)
+        self.shift_use_vy = info["shift_use_vy"]
+        self.increment_i = info["increment_i"]
+        return info["clock"]
+
     def fetch_opcode(self) -> int:
-        return self.memory[int(self._pc)] << 8 | self.memory[int(self._pc) + 1]
+        ram = self._ram
+        pc = self._pc
+        return ram[pc] << 8 | ram[pc + 1]
+
+    def select_dispatch(self, mode: str = "table") -> None:
+        """Choose how cycle() dispatches opcodes.
+        "decoder":   walk the original Decoder if/elif chain, one instruction per cycle.
+        "table":     look the opcode up in the prebuilt table, one instruction per cycle.
+        "translate": run a whole cached basic block per cycle, see core/translator.py.
+        """
+        # Single table steps, also used by run() and the translator when a block does not fit.
+        if self.history is not None:
+            self._step = self._cycle_table
+        else:
+            self._step = self._cycle_table_no_history
+
+        if mode == "decoder":
+            self.cycle = self._cycle_decoder
+        elif mode == "table":
+            self.cycle = self._step
+        elif mode == "translate":
+            if self.translator is None:
+                self.translator = Translator(self)
+            self.cycle = self._cycle_translate
+        else:
+            raise ValueError(f"Unknown dispatch mode {mode!r}")
+        self.dispatch_mode = mode
+
+    def set_history_depth(self, depth: int) -> None:
+        """Keep the last `depth` executed (opcode, pc) pairs, 0 turns recording off
+        so the dispatch loop does no history work at all.
+        """
+        self.MAX_HISTORY_LENGTH = depth
+        self.history = OpcodeHistory(depth) if depth > 0 else None
+        if self.translator is not None:
+            # blocks have the history recording compiled in
+            self.translator.flush()
+        self.select_dispatch(self.dispatch_mode)
+
+    def cycle(self) -> int:
+        # Replaced per instance by select_dispatch().
+        return self._cycle_table()
+
+    def run(self, cycles: int) -> int:
+        """Execute up to `cycles` instructions and return how many actually ran.
+        Stops early on an exception or when the ROM waits for a key.
+        """
+        executed = 0
+        translator = self.translator if self.dispatch_mode == "translate" else None
+        skip_idle = self.skip_idle
+        while executed < cycles and not self._is_exceptions and not self._is_waiting_key:
+            pc = self._pc
+            if translator is not None:
+                block, _ = translator.lookup(pc)
+                # blocks longer than what is left stop after `budget` instructions
+                executed += block(self, cycles - executed)
+            else:
+                executed += self.cycle()
+            if skip_idle and pc - 4 <= self._pc <= pc:
+                # short jump back, maybe the end of an idle loop
+                executed += self._skip_idle_loop(cycles - executed)
+        return executed
+
+    def _skip_idle_loop(self, budget: int) -> int:
+        """Fast-forward an idle loop starting at the PC through up to `budget` instructions.
+        Returns the number of instructions skipped, 0 when the PC is not in an idle loop.
+
+        Recognised loops, which cannot exit before the next timer tick or key update
+        since neither happens inside run():
+            1nnn              jump to itself
+            Fx07 3xkk 1nnn    wait for DT == kk (4xkk: for DT != kk)
+            Ex9E 1nnn         wait for key Vx (ExA1: for its release)
+        """
+        pc = self._pc
+        if pc in self._not_idle or pc + 6 > MEMORY_SIZE:
+            return 0
+        read_word = self.memory.read_word
+        loop_back = 0x1000 | pc
+        first = read_word(pc)
+        if first == loop_back:
+            opcodes = (first,)
+        elif first & 0xF0FF == 0xF007 and read_word(pc + 4) == loop_back and read_word(pc + 2) >> 12 in (0x3, 0x4):
+            test = read_word(pc + 2)
+            x_reg = first >> 8 & 0x0F
+            if test >> 8 & 0x0F != x_reg:
+                self._not_idle.add(pc)
+                return 0
+            if (self._dt == test & 0xFF) == (test >> 12 == 0x3):
+                # the skip is taken on this pass, the loop exits
+                return 0
+            opcodes = (first, test, loop_back)
+        elif first & 0xF0FF in (0xE09E, 0xE0A1) and read_word(pc + 2) == loop_back:
+            pressed = bool(self.keyboard.is_pressed(self._v[first >> 8 & 0x0F]))
+            if pressed == (first & 0xFF == 0x9E):
+                return 0
+            opcodes = (first, loop_back)
+        else:
+            self._not_idle.add(pc)
+            return 0
+
+        skipped = budget - budget % len(opcodes)
+        if not skipped:
+            return 0
+        if len(opcodes) == 3:
+            self._v[first >> 8 & 0x0F] = self._dt
+        if self.history is not None:
+            # the last `depth` skipped instructions, as if every pass had been executed
+            count = min(self.history.depth, skipped)
+            passes = -(-count // len(opcodes))
+            loop = tuple((opcode, pc + 2 * offset) for offset, opcode in enumerate(opcodes))
+            self.history.extend((loop * passes)[-count:])
+        self._current_opcode = opcodes[-1]
+        return skipped
+
+    def _cycle_table(self) -> int:
+        ram = self._ram
+        pc = self._pc
+        opcode = ram[pc] << 8 | ram[pc + 1]
+        self._current_opcode = opcode
+        self.history.record(opcode, pc)
+
+        handler, operands = self._opcode_table[opcode]
+        handler(self, *operands)
+        return 1
 
-    def cycle(self):
+    def _cycle_table_no_history(self) -> int:
+        ram = self._ram
+        pc = self._pc
+        opcode = ram[pc] << 8 | ram[pc + 1]
+        self._current_opcode = opcode
+
+        handler, operands = self._opcode_table[opcode]
+        handler(self, *operands)
+        return 1
+
+    def _cycle_translate(self) -> int:
+        block, _ = self.translator.lookup(self._pc)
+        return block(self)
+
+    @classmethod
+    def _build_opcode_table(cls) -> list:
+        """Map all 65536 opcodes to (unbound handler, operands) with x/y/kk/nnn already extracted."""
+        sub_8xyn = {
+            0x0: cls._execute_8xy0_ld_vx_vy,
+            0x1: cls._execute_8xy1_or_vx_vy,
+            0x2: cls._execute_8xy2_and_vx_vy,
+            0x3: cls._execute_8xy3_xor_vx_vy,
+            0x4: cls._execute_8xy4_add_vx_vy,
+            0x5: cls._execute_8xy5_sub_vx_vy,
+            0x6: cls._execute_8xy6_shr_vx_vy,
+            0x7: cls._execute_8xy7_subn_vx_vy,
+            0xe: cls._execute_8xye_shl_vx_vy,
+        }
+        sub_exkk = {
+            0x9e: cls._execute_ex9e_skp_vx,
+            0xa1: cls._execute_exa1_sknp_vx,
+        }
+        sub_fxkk = {
+            0x07: cls._execute_fx07_ld_vx_dt,
+            0x0a: cls._execute_fx0a_ld_vx_k,
+            0x15: cls._execute_fx15_ld_dt_vx,
+            0x18: cls._execute_fx18_ld_st_vx,
+            0x1e: cls._execute_fx1e_add_i_vx,
+            0x29: cls._execute_fx29_ld_f_vx,
+            0x33: cls._execute_fx33_ld_b_vx,
+            0x55: cls._execute_fx55_ld_i_vx,
+            0x65: cls._execute_fx65_ld_vx_i,
+        }
+        by_addr = {
+            0x1: cls._execute_1nnn_jp_addr,
+            0x2: cls._execute_2nnn_call_addr,
+            0xa: cls._execute_annn_ld_i_addr,
+            0xb: cls._execute_bnnn_jp_v0_addr,
+        }
+        by_x_kk = {
+            0x3: cls._execute_3xkk_se_vx_byte,
+            0x4: cls._execute_4xkk_sne_vx_byte,
+            0x6: cls._execute_6xkk_ld_vx_byte,
+            0x7: cls._execute_7xkk_add_vx_byte,
+            0xc: cls._execute_cxkk_rnd_vx_byte,
+        }
+        by_x_y = {
+            0x5: cls._execute_5xy0_se_vx_vy,
+            0x9: cls._execute_9xy0_sne_vx_vy,
+        }
+
+        table = []
+        for opcode in range(0x10000):
+            msn = opcode >> 12
+            x_reg = opcode >> 8 & 0x0F
+            y_reg = opcode >> 4 & 0x0F
+            kk = opcode & 0x00FF
+            n = opcode & 0x000F
+            addr = opcode & 0x0FFF
+            if msn == 0x0:
+                if opcode == 0x00e0:
+                    entry = (cls._execute_0x00e0_cls, ())
+                elif opcode == 0x00ee:
+                    entry = (cls._execute_0x00ee_ret, ())
+                else:
+                    # 0X0NNN (SYS addr) - ignored, same as the decoder path
+                    entry = (cls._execute_0nnn_sys_addr, (addr,))
+            elif msn in by_addr:
+                entry = (by_addr[msn], (addr,))
+            elif msn in by_x_kk:
+                entry = (by_x_kk[msn], (x_reg, kk))
+            elif msn in by_x_y:
+                entry = (by_x_y[msn], (x_reg, y_reg))
+            elif msn == 0x8:
+                if n in sub_8xyn:
+                    entry = (sub_8xyn[n], (x_reg, y_reg))
+                else:
+                    entry = (cls._execute_unknown, (f"Unkown 8XYN opcode {opcode:04X}",))
+            elif msn == 0xd:
+                entry = (cls._execute_dxyn_drw_vx_vy_nibble, (x_reg, y_reg, n))
+            elif msn == 0xe:
+                if kk in sub_exkk:
+                    entry = (sub_exkk[kk], (x_reg,))
+                else:
+                    entry = (cls._execute_unknown, (f"Unknown EXNN opcode {opcode:04X}",))
+            else:
+                if kk in sub_fxkk:
+                    entry = (sub_fxkk[kk], (x_reg,))
+                else:
+                    entry = (cls._execute_unknown, (f"Unknown FXNN opcode {hex(opcode)}",))
+            table.append(entry)
+        return table
+
+    def _cycle_decoder(self) -> int:
         opcode = self.fetch_opcode()
         decoder = self.decoder
         msn = decoder._nibble(opcode)
         self._current_opcode = opcode
-        self._opcode_history.insert(0, opcode)
-        if len(self._opcode_history) > self.MAX_HISTORY_LENGTH:
-            self._opcode_history.pop()
+        if self.history is not None:
+            self.history.record(opcode, self._pc)
 
         if msn == 0x0:
             if opcode == 0x00e0:
@@ -201,6 +465,19 @@ class Core:
             else:
                 self._exceptions = f"Unknown FXNN opcode {hex(opcode)}"
                 self._is_exceptions = True
+        return 1
+
+    def _execute_unknown(self, message: str) -> None:
+        self._exceptions = message
+        self._is_exceptions = True
+
+    def _memory_out_of_range(self) -> None:
+        # a slice store past the end would grow the bytearray, stop here instead
+        self._exceptions = f"Runtime Error: memory access out of range (PC: {hex(self._pc)}, I: {hex(self._i)})"
+        self._is_exceptions = True
+
+    def _execute_0nnn_sys_addr(self, addr: int) -> None:
+        """Jump to a machine code routine at nnn. Ignored."""
 
     def _execute_0x00e0_cls(self):
         """Clear the display."""
@@ -264,8 +541,7 @@ class Core:
     
     def _execute_7xkk_add_vx_byte(self, x_reg: int, kk: int) -> None:
         """Set Vx = Vx + kk."""
-        add = int(self._v[x_reg]) + int(kk)
-        self._v[x_reg] = add & 0xff
+        self._v[x_reg] = (self._v[x_reg] + kk) & 0xff
         self._pc += 2
 
     def _execute_8xy0_ld_vx_vy(self, x_reg: int, y_reg: int) -> None:
@@ -301,7 +577,7 @@ class Core:
             self._v[0xf] = 1
         else:
             self._v[0xf] = 0
-        self._v[x_reg] = int(self._v[x_reg] - self._v[y_reg]) & 0xff
+        self._v[x_reg] = (self._v[x_reg] - self._v[y_reg]) & 0xff
         self._pc += 2
 
     def _execute_8xy6_shr_vx_vy(self, x_reg: int, y_reg: int) -> None:
@@ -312,10 +588,7 @@ class Core:
 
             y_reg: use for super chip8 later or so
         """
-        # self._v[0xf] = self._v[x_reg] & 1
-        # self._v[x_reg] = self._v[x_reg] >> 1
-        # self._pc += 2
-        if self.shift_uses_vy:
+        if self.shift_use_vy:
             self._v[0xF] = self._v[y_reg] & 1
             self._v[x_reg] = self._v[y_reg] >> 1
         else:
@@ -333,7 +606,7 @@ class Core:
         else:
             self._v[0xf] = 0
         
-        self._v[x_reg] = np.uint8(self._v[y_reg] - self._v[x_reg])
+        self._v[x_reg] = (self._v[y_reg] - self._v[x_reg]) & 0xff
         self._pc += 2
 
     def _execute_8xye_shl_vx_vy(self, x_reg: int, y_reg: int) -> None:
@@ -342,7 +615,7 @@ class Core:
            Then Vx is multiplied by 2.
         """
 
-        if self.shift_uses_vy:
+        if self.shift_use_vy:
             self._v[0xF] = (self._v[y_reg] & 0x80) >> 7
             self._v[x_reg] = (self._v[y_reg] << 1) & 0xFF
         else:
@@ -373,18 +646,9 @@ class Core:
     
     def _execute_dxyn_drw_vx_vy_nibble(self, x_reg: int, y_reg: int, n_height: int) -> None:
         """Display n-byte sprite starting at memory location I at (Vx, Vy), set VF = collision."""
-        x = int(self._v[x_reg])
-        y = int(self._v[y_reg])
-
-        self._v[0xf] = 0
-        for row in range(n_height):
-            sprite_byte = self.memory[int(self._i) + int(row)]
-            
-            for col in range(8):
-                sprite_pixel = (sprite_byte >> (7 - col)) & 1
-                if sprite_pixel == 1:
-                    if self.display.set_pixel(x + col, y + row):
-                        self._v[0xf] = 1
+        sprite = self._ram[self._i:self._i + n_height]
+        collision = self.display.draw_sprite(self._v[x_reg], self._v[y_reg], sprite)
+        self._v[0xf] = 1 if collision else 0
         self._pc += 2
 
     def _execute_ex9e_skp_vx(self, x_reg: int) -> None:
@@ -420,6 +684,12 @@ class Core:
         self._pressed_key = x_reg
 
 
+    def resume_with_key(self, key: int) -> None:
+        """Finish a pending Fx0A wait, storing `key` in Vx."""
+        self._v[self._pressed_key] = key
+        self._is_waiting_key = False
+        self._pc += 2
+
     def _execute_fx15_ld_dt_vx(self, x_reg: int) -> None:
         """Set delay timer = Vx.
         DT is set equal to the value of Vx.
@@ -438,14 +708,14 @@ class Core:
         """Set I = I + Vx.
         The values of I and Vx are added, and the results are stored in I.
         """
-        add = int(self._i) + int(self._v[x_reg])
+        add = self._i + self._v[x_reg]
         self._v[0xF] = 1 if add > 0xFFF else 0
         self._i = add & 0X0FFF
         self._pc += 2
 
     def _execute_fx29_ld_f_vx(self, x_reg: int) -> None:
         """Set I = location of sprite for digit Vx."""
-        i = int(self._v[x_reg]) * 5
+        i = self._v[x_reg] * 5
         self._i = i & 0X0FFF
         self._pc += 2
 
@@ -454,18 +724,22 @@ class Core:
         The interpreter takes the decimal value of Vx, and places the hundreds digit 
         in memory at location in I, the tens digit at location I+1, and the ones digit
         at location I+2."""
+        if self._i + 3 > MEMORY_SIZE:
+            self._memory_out_of_range()
+            return
         value = self._v[x_reg]
-        self.memory[self._i] = value // 100
-        self.memory[self._i + 1] = (value % 100) // 10
-        self.memory[self._i + 2] = value % 10
+        # one ranged store, so write_hook and the write watches see a single write
+        self.memory[self._i:self._i + 3] = bytes((value // 100, (value % 100) // 10, value % 10))
         self._pc += 2
 
     def _execute_fx55_ld_i_vx(self, x_reg: int) -> None:
         """Store registers V0 through Vx in memory starting at location I.
         The interpreter copies the values of registers V0 through Vx into memory, 
         starting at the address in I."""
-        for x in range(x_reg + 1):
-            self.memory[self._i + x] = self._v[x]
+        if self._i + x_reg + 1 > MEMORY_SIZE:
+            self._memory_out_of_range()
+            return
+        self.memory[self._i:self._i + x_reg + 1] = self._v[:x_reg + 1]
 
         if self.increment_i:  # COSMAC VIP style
             self._i += x_reg + 1
@@ -477,7 +751,7 @@ class Core:
         into registers V0 through Vx.
         """
         for x in range(x_reg + 1):
-            self._v[x] = self.memory[self._i + x]
+            self._v[x] = self._ram[self._i + x]
 
         if self.increment_i:  # COSMAC VIP style
             self._i += x_reg + 1
@@ -493,3 +767,54 @@ class Core:
             self._st -= 1
             # add sound playing logic here.
 
+    def save_state(self) -> bytes:
+        """Snapshot of the machine: registers, stack, timers, key wait, memory and screen."""
+        display = self.display
+        header = _STATE_HEADER.pack(
+            STATE_MAGIC, STATE_VERSION,
+            self._pc, self._i, self._sp, self._dt, self._st,
+            self._is_waiting_key, self._pressed_key,
+            display.x_axis, display.y_axis,
+            bytes(self._v), *self._stack,
+        )
+        return b"".join((header, self._ram, display.framebuffer.tobytes()))
+
+    def load_state(self, state: bytes) -> None:
+        """Restore a save_state() snapshot. Raises ValueError if it is not one of ours."""
+        if len(state) < _STATE_HEADER.size:
+            raise ValueError(f"Save state too short: {len(state)} bytes")
+        (
+            magic, version,
+            pc, i, sp, dt, st,
+            is_waiting_key, pressed_key,
+            width, height,
+            v, *stack,
+        ) = _STATE_HEADER.unpack_from(state)
+        if magic != STATE_MAGIC:
+            raise ValueError("Not a save state")
+        if version != STATE_VERSION:
+            raise ValueError(f"Save state version {version}, expected {STATE_VERSION}")
+        pixels_at = _STATE_HEADER.size + MEMORY_SIZE
+        if len(state) != pixels_at + height * ((width + 7) // 8):
+            raise ValueError(f"Save state size {len(state)} does not match a {width}x{height} screen")
+
+        view = memoryview(state)
+        self.memory[0:MEMORY_SIZE] = view[_STATE_HEADER.size:pixels_at]
+        display = self.display
+        if (display.x_axis, display.y_axis) != (width, height):
+            display.set_resolution(width, height)
+        display.framebuffer.frombytes(view[pixels_at:])
+
+        self._v[:] = v
+        self._stack[:] = stack
+        self._pc = pc
+        self._i = i
+        self._sp = sp
+        self._dt = dt
+        self._st = st
+        self._is_waiting_key = is_waiting_key
+        self._pressed_key = pressed_key
+        self._not_idle.clear()
+        self._exceptions = ""
+        self._is_exceptions = False
+        self._is_rom_loaded = True
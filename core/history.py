@@ -0,0 +1,47 @@
+class OpcodeHistory:
+    """Fixed-size ring buffer of the last executed (opcode, pc) pairs.
+    Nothing is allocated while recording, old entries are simply overwritten.
+    """
+
+    def __init__(self, depth: int = 10) -> None:
+        self.depth: int = depth
+        self.version: int = 0 # goes up on every record and clear, never resets
+        self._count: int = 0
+        self._opcodes: list = [0] * depth
+        self._pcs: list = [0] * depth
+        self._next: int = 0 # slot the next entry goes to
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, opcode: int, pc: int) -> None:
+        slot = self._next
+        self._opcodes[slot] = opcode
+        self._pcs[slot] = pc
+        slot += 1
+        self._next = slot if slot < self.depth else 0
+        if self._count < self.depth:
+            self._count += 1
+        self.version += 1
+
+    def extend(self, entries: tuple) -> None:
+        """Record several (opcode, pc) pairs, oldest first."""
+        for opcode, pc in entries:
+            self.record(opcode, pc)
+
+    def latest(self, count: int | None = None) -> list:
+        """Returns up to `count` (opcode, pc) pairs, newest first."""
+        size = len(self)
+        if count is None or count > size:
+            count = size
+        slot = self._next
+        entries = []
+        for _ in range(count):
+            slot = slot - 1 if slot > 0 else self.depth - 1
+            entries.append((self._opcodes[slot], self._pcs[slot]))
+        return entries
+
+    def clear(self) -> None:
+        self._count = 0
+        self._next = 0
+        self.version += 1
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+
+INDEX_NAME = ".rom_index.json" # kept inside the ROM directory, dot files are not listed as ROMs
+INDEX_VERSION = 1
+ROM_START = 0x200
+
+# platform -> (shift_use_vy, increment_i, suggested clock in Hz)
+# CHIP-8 keeps Core's defaults, the CHIP-48 behaviour most CHIP-8 collections were tested against.
+PLATFORM_SETTINGS = {
+    "CHIP-8": (False, False, 500),
+    "SCHIP": (False, False, 1000),
+    "XO-CHIP": (True, True, 6000),
+}
+
+
+def reachable_opcodes(rom: bytes) -> list:
+    """Opcodes reachable from 0x200 by following jumps, calls and skips.
+    Sprite data never gets decoded this way, so it cannot pass for an instruction.
+    """
+    opcodes = []
+    seen = set()
+    pending = [ROM_START]
+    end = ROM_START + len(rom) - 1
+    while pending:
+        pc = pending.pop()
+        while ROM_START <= pc < end and pc not in seen:
+            seen.add(pc)
+            offset = pc - ROM_START
+            opcode = rom[offset] << 8 | rom[offset + 1]
+            opcodes.append(opcode)
+            nibble = opcode >> 12
+            if nibble == 0x1:
+                pc = opcode & 0x0FFF
+                continue
+            if opcode in (0x00EE, 0x00FD) or nibble == 0xB:
+                # return, SCHIP exit, or a computed jump we cannot follow
+                break
+            if nibble == 0x2:
+                pending.append(opcode & 0x0FFF)
+            elif nibble in (0x3, 0x4, 0x5, 0x9) or (nibble == 0xE and opcode & 0xFF in (0x9E, 0xA1)):
+                pending.append(pc + 4)
+            elif opcode == 0xF000:
+                # XO-CHIP i := long NNNN, a 4 byte instruction
+                pc += 2
+            pc += 2
+    return opcodes
+
+
+def detect_platform(rom: bytes) -> str:
+    """CHIP-8, SCHIP or XO-CHIP, from the extension opcodes the ROM executes."""
+    platform = "CHIP-8"
+    for opcode in reachable_opcodes(rom):
+        if (
+            opcode == 0xF000 or opcode == 0xF002
+            or opcode & 0xF00E == 0x5002         # 5XY2 / 5XY3 save and load a register range
+            or opcode & 0xF0FF in (0xF001, 0xF03A)  # plane, pitch
+            or opcode & 0xFFF0 == 0x00D0           # scroll up
+        ):
+            return "XO-CHIP"
+        if (
+            opcode in (0x00FB, 0x00FC, 0x00FD, 0x00FE, 0x00FF)
+            or opcode & 0xFFF0 == 0x00C0           # scroll down
+            or opcode & 0xF00F == 0xD000           # 16x16 sprite
+            or opcode & 0xF0FF in (0xF030, 0xF075, 0xF085)
+        ):
+            platform = "SCHIP"
+    return platform
+
+
+def analyze_rom(rom: bytes) -> dict:
+    platform = detect_platform(rom)
+    shift_use_vy, increment_i, clock = PLATFORM_SETTINGS[platform]
+    return {
+        "size": len(rom),
+        "platform": platform,
+        "shift_use_vy": shift_use_vy,
+        "increment_i": increment_i,
+        "clock": clock,
+    }
+
+
+class RomLibrary:
+    """The ROMs in a directory, with an on-disk index of their metadata keyed by content hash.
+
+    `files` maps a file name to its hash, size and mtime, `roms` maps a hash to what
+    analyze_rom() found. refresh() only reads files that are new or whose size or
+    mtime changed, so an unchanged library costs one directory scan.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory: str = directory
+        self.index_path: str = os.path.join(directory, INDEX_NAME)
+        self.files: dict = {}
+        self.roms: dict = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_path) as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            return
+        if index.get("version") == INDEX_VERSION:
+            self.files = index["files"]
+            self.roms = index["roms"]
+
+    def save(self) -> None:
+        temporary = self.index_path + ".tmp"
+        with open(temporary, "w") as file:
+            json.dump({"version": INDEX_VERSION, "files": self.files, "roms": self.roms}, file, indent=1)
+        os.replace(temporary, self.index_path)
+
+    def refresh(self) -> bool:
+        """Sync the index with the directory, returns True if anything changed (the index is then saved)."""
+        files = {}
+        changed = False
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                known = self.files.get(entry.name)
+                if known is not None and known["mtime"] == stat.st_mtime_ns and known["size"] == stat.st_size:
+                    files[entry.name] = known
+                    continue
+                with open(entry.path, "rb") as file:
+                    rom = file.read()
+                digest = hashlib.sha1(rom).hexdigest()
+                files[entry.name] = {"hash": digest, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+                if digest not in self.roms:
+                    self.roms[digest] = analyze_rom(rom)
+                changed = True
+
+        if files.keys() != self.files.keys():
+            changed = True
+        self.files = files
+        hashes = {file["hash"] for file in files.values()}
+        for digest in [digest for digest in self.roms if digest not in hashes]:
+            del self.roms[digest]
+            changed = True
+        if changed:
+            try:
+                self.save()
+            except OSError:
+                # read-only library, keep the index in memory
+                pass
+        return changed
+
+    def names(self) -> list:
+        return sorted(self.files)
+
+    def info(self, name: str) -> dict:
+        """Metadata of a ROM by file name: size, platform, shift_use_vy, increment_i, clock."""
+        return self.roms[self.files[name]["hash"]]
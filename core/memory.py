@@ -124,34 +124,117 @@ class Memory:
 
     def __init__(self) -> None:
         self.__memory = bytearray(4096)
+        # Raw view for hot path reads, the bytearray is only ever changed in place so it stays valid.
+        # Writes must go through __setitem__ so write_hook sees them.
+        self.buffer: memoryview = memoryview(self.__memory)
         self.__init_default_sprite()
+        # Called as write_hook(start, end) after every write, e.g. to drop translated code.
+        self.write_hook: object = None
 
     def __len__(self) -> int:
         return len(self.__memory)
 
     def __init_default_sprite(self) -> None:
-        location = 0X0 # Most emulator start in 0x050 for the default sprite. 
-        for char_sprite in self.__CHAR_CONTANTS:
-            self.__memory[location] = char_sprite
-            location += 1
-
-    def __getitem__(self, key: slice | int) -> list:
-        if isinstance(key, slice):
-            return self.__memory[key]
-        elif isinstance(key, int):
-            return self.__memory[key]
-
-        raise TypeError(
-            f"Memory indices must be integers or slices, not {type(key).__name__}"
-        )
-
-    def __setitem__(self, location: int, data: int) -> None:
+        # Most emulator start in 0x050 for the default sprite. 
+        self.__memory[0:len(self.__CHAR_CONTANTS)] = bytes(self.__CHAR_CONTANTS)
+
+    def __getitem__(self, key: slice | int) -> int | bytearray:
+        # bytearray raises the TypeError for anything else
+        return self.__memory[key]
+
+    def read_word(self, address: int) -> int:
+        """Big-endian 16-bit word at address, i.e. an opcode."""
+        memory = self.__memory
+        return memory[address] << 8 | memory[address + 1]
+
+    def __setitem__(self, location: slice | int, data: int) -> None:
         self.__memory[location] = data
+        if self.write_hook is not None:
+            if isinstance(location, slice):
+                start, end, _ = location.indices(len(self.__memory))
+                self.write_hook(start, end)
+            else:
+                self.write_hook(location, location + 1)
     
     def __repr__(self) -> str:
         return f"Type={type(self.__memory).__name__}  size={len(self.__memory)}"
     
     def clear(self) -> None:
-        self.__memory = bytearray(len(self.__memory))
+        """Zero everything except the font sprites, in place."""
+        self.__memory[:] = bytes(len(self.__memory))
+        self.__init_default_sprite()
+        if self.write_hook is not None:
+            self.write_hook(0, len(self.__memory))
 
     
+
+    def enable_tracking(self) -> "TrackedMemory":
+        """Switch this instance to TrackedMemory (dirty pages and watches), returns it.
+        Plain Memory pays nothing for tracking it does not use.
+        """
+        if not isinstance(self, TrackedMemory):
+            self.__class__ = TrackedMemory
+            self._init_tracking()
+        return self
+
+
+class TrackedMemory(Memory):
+    """Memory that records which PAGE_SIZE pages were written and calls watch callbacks.
+    Get one with Memory.enable_tracking(), disable_tracking() turns it back into Memory.
+    """
+    PAGE_SIZE: int = 64
+    PAGE_SHIFT: int = 6
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._init_tracking()
+
+    def _init_tracking(self) -> None:
+        self.dirty: bytearray = bytearray(len(self) >> self.PAGE_SHIFT) # dirty[page] is 1 once written
+        self._watches: dict = {} # handle -> (start, end, callback)
+        self._next_handle: int = 0
+
+    def disable_tracking(self) -> None:
+        del self.dirty, self._watches, self._next_handle
+        self.__class__ = Memory
+
+    def watch(self, start: int, end: int, callback: object) -> int:
+        """Call callback(start, end) with the written part of [start, end) after every write that overlaps it.
+        Returns a handle for unwatch().
+        """
+        handle = self._next_handle
+        self._next_handle += 1
+        self._watches[handle] = (start, end, callback)
+        return handle
+
+    def unwatch(self, handle: int) -> None:
+        del self._watches[handle]
+
+    def take_dirty(self) -> list:
+        """Numbers of the pages written since the last call, the bitmap is reset."""
+        dirty = self.dirty
+        pages = [page for page, flag in enumerate(dirty) if flag]
+        dirty[:] = bytes(len(dirty))
+        return pages
+
+    def __setitem__(self, location: slice | int, data: int) -> None:
+        super().__setitem__(location, data)
+        if isinstance(location, slice):
+            start, end, _ = location.indices(len(self))
+        else:
+            start, end = location, location + 1
+        self._track(start, end)
+
+    def clear(self) -> None:
+        super().clear()
+        self._track(0, len(self))
+
+    def _track(self, start: int, end: int) -> None:
+        if start >= end:
+            return
+        first = start >> self.PAGE_SHIFT
+        last = (end - 1) >> self.PAGE_SHIFT
+        self.dirty[first:last + 1] = b"\x01" * (last - first + 1)
+        for watch_start, watch_end, callback in tuple(self._watches.values()):
+            if start < watch_end and watch_start < end:
+                callback(max(start, watch_start), min(end, watch_end))
@@ -0,0 +1,157 @@
+import json
+import time
+
+MEMORY_SIZE = 0x1000
+HANDLER_PREFIX = "_execute_"
+
+
+def handler_name(handler: object) -> str:
+    """Opcode class of a handler, e.g. _execute_8xy4_add_vx_vy -> 8xy4_add_vx_vy."""
+    name = handler.__name__
+    return name[len(HANDLER_PREFIX):] if name.startswith(HANDLER_PREFIX) else name
+
+
+class Profiler:
+    """Counts executed instructions per opcode class (handler) and per PC.
+
+    start() swaps Core.cycle and Core._step for a counting table step and stop()
+    puts the previous dispatch back, so a Core that is not being profiled runs
+    exactly the code it always did. Translated blocks are bypassed while profiling,
+    since they execute many instructions per call. Idle loops that run() fast-forwards
+    are not executed and not counted.
+
+    With timing=True every `sample_every`-th instruction also has its handler timed,
+    mean_ns in the report is the mean over those samples.
+    """
+
+    def __init__(self, core: object, timing: bool = False, sample_every: int = 8) -> None:
+        self.core: object = core
+        self.timing: bool = timing
+        self.sample_every: int = sample_every
+        self.counts: dict = {} # handler -> executions
+        self.samples: dict = {} # handler -> [timed executions, total ns]
+        self.pcs: list = [0] * MEMORY_SIZE # executions per address
+        self._countdown: int = sample_every
+        self._dispatch_mode: str | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._dispatch_mode is not None
+
+    @property
+    def instructions(self) -> int:
+        return sum(self.counts.values())
+
+    def start(self) -> None:
+        core = self.core
+        if self.running:
+            return
+        self._dispatch_mode = core.dispatch_mode
+        # "table" keeps run() off the translator, then the counting step replaces the table step
+        core.select_dispatch("table")
+        core.cycle = core._step = self._step_timed if self.timing else self._step
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self.core.select_dispatch(self._dispatch_mode)
+        self._dispatch_mode = None
+
+    def clear(self) -> None:
+        self.counts.clear()
+        self.samples.clear()
+        self.pcs[:] = [0] * MEMORY_SIZE
+        self._countdown = self.sample_every
+
+    def _step(self) -> int:
+        core = self.core
+        ram = core._ram
+        pc = core._pc
+        opcode = ram[pc] << 8 | ram[pc + 1]
+        core._current_opcode = opcode
+        if core.history is not None:
+            core.history.record(opcode, pc)
+
+        handler, operands = core._opcode_table[opcode]
+        counts = self.counts
+        counts[handler] = counts.get(handler, 0) + 1
+        self.pcs[pc] += 1
+        handler(core, *operands)
+        return 1
+
+    def _step_timed(self) -> int:
+        core = self.core
+        ram = core._ram
+        pc = core._pc
+        opcode = ram[pc] << 8 | ram[pc + 1]
+        core._current_opcode = opcode
+        if core.history is not None:
+            core.history.record(opcode, pc)
+
+        handler, operands = core._opcode_table[opcode]
+        counts = self.counts
+        counts[handler] = counts.get(handler, 0) + 1
+        self.pcs[pc] += 1
+        self._countdown -= 1
+        if self._countdown:
+            handler(core, *operands)
+            return 1
+
+        self._countdown = self.sample_every
+        start = time.perf_counter_ns()
+        handler(core, *operands)
+        elapsed = time.perf_counter_ns() - start
+        sample = self.samples.get(handler)
+        if sample is None:
+            self.samples[handler] = [1, elapsed]
+        else:
+            sample[0] += 1
+            sample[1] += elapsed
+        return 1
+
+    def to_dict(self, pc_limit: int | None = None) -> dict:
+        """Handlers sorted by count, then the hottest PCs (all executed ones unless pc_limit)."""
+        total = self.instructions
+        handlers = []
+        for handler, count in sorted(self.counts.items(), key=lambda item: item[1], reverse=True):
+            entry = {"name": handler_name(handler), "count": count, "share": count / total}
+            sample = self.samples.get(handler)
+            if sample is not None:
+                entry["sampled"] = sample[0]
+                entry["mean_ns"] = sample[1] / sample[0]
+            handlers.append(entry)
+
+        read_word = self.core.memory.read_word
+        hot = sorted((pc for pc, count in enumerate(self.pcs) if count), key=self.pcs.__getitem__, reverse=True)
+        pcs = [
+            {
+                "pc": f"0x{pc:03X}",
+                # what is there now, self-modifying code may have run something else
+                "opcode": f"0x{read_word(pc):04X}" if pc + 1 < MEMORY_SIZE else None,
+                "count": self.pcs[pc],
+                "share": self.pcs[pc] / total,
+            }
+            for pc in hot[:pc_limit]
+        ]
+        return {
+            "instructions": total,
+            "sample_every": self.sample_every if self.timing else None,
+            "handlers": handlers,
+            "pcs": pcs,
+        }
+
+    def save_json(self, path: str) -> None:
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def report(self, pc_limit: int = 20) -> str:
+        """Plain text: handlers by count, then the `pc_limit` hottest addresses."""
+        data = self.to_dict(pc_limit)
+        lines = [f"{data['instructions']:,} instructions", "", f"{'handler':<24}{'count':>14}{'share':>9}{'ns':>9}"]
+        for entry in data["handlers"]:
+            mean = f"{entry['mean_ns']:9.0f}" if "mean_ns" in entry else f"{'-':>9}"
+            lines.append(f"{entry['name']:<24}{entry['count']:>14,}{entry['share']:>9.1%}{mean}")
+        lines += ["", f"{'pc':<8}{'opcode':<10}{'count':>14}{'share':>9}"]
+        for entry in data["pcs"]:
+            lines.append(f"{entry['pc']:<8}{entry['opcode'] or '-':<10}{entry['count']:>14,}{entry['share']:>9.1%}")
+        return "\n".join(lines)
@@ -0,0 +1,115 @@
+import struct
+from collections import deque
+
+import numpy as np
+
+# A delta is a run list: (offset, length) header then `length` XOR bytes, repeated.
+_RUN_HEADER = struct.Struct("<HH")
+
+
+def _encode(xor: np.ndarray) -> bytes:
+    """Run-length encode the non-zero stretches of an XOR delta."""
+    changed = np.flatnonzero(xor)
+    if not changed.size:
+        return b""
+    # gaps shorter than a run header are cheaper to keep inside the run
+    breaks = np.flatnonzero(np.diff(changed) > _RUN_HEADER.size) + 1
+    starts = changed[np.r_[0, breaks]].tolist()
+    ends = (changed[np.r_[breaks - 1, -1]] + 1).tolist()
+    parts = []
+    for start, end in zip(starts, ends):
+        parts.append(_RUN_HEADER.pack(start, end - start))
+        parts.append(xor[start:end].tobytes())
+    return b"".join(parts)
+
+
+def _apply(state: np.ndarray, delta: bytes) -> None:
+    """XOR a delta into `state` in place, which steps it forwards or backwards one frame."""
+    offset = 0
+    while offset < len(delta):
+        start, length = _RUN_HEADER.unpack_from(delta, offset)
+        offset += _RUN_HEADER.size
+        state[start:start + length] ^= np.frombuffer(delta, dtype=np.uint8, count=length, offset=offset)
+        offset += length
+
+
+class Rewind:
+    """Per-frame Core.save_state() history for stepping gameplay backwards.
+
+    Every `keyframe_interval` frames the full state is kept, the frames in between
+    only store the XOR against the previous frame, run-length encoded. Oldest frames
+    are dropped a keyframe group at a time once the buffer goes over `max_bytes`.
+    """
+
+    def __init__(self, core: object, keyframe_interval: int = 60, max_bytes: int = 8 * 1024 * 1024) -> None:
+        self.core: object = core
+        self.keyframe_interval: int = keyframe_interval
+        self.max_bytes: int = max_bytes
+        self.size: int = 0 # bytes held by the entries
+        self._entries: deque = deque() # (is keyframe, full state or delta)
+        self._last: np.ndarray | None = None # newest recorded state
+        self._since_keyframe: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+        self._last = None
+        self._since_keyframe = 0
+
+    def record(self) -> None:
+        """Snapshot the current frame."""
+        state = self.core.save_state()
+        current = np.frombuffer(state, dtype=np.uint8)
+        last = self._last
+        if last is None or self._since_keyframe >= self.keyframe_interval or last.size != current.size:
+            entry = (True, state)
+            self._since_keyframe = 0
+        else:
+            entry = (False, _encode(current ^ last))
+        self._entries.append(entry)
+        self._last = current
+        self._since_keyframe += 1
+        self.size += len(entry[1])
+        self._evict()
+
+    def step_back(self) -> bool:
+        """Restore the frame before the newest one, returns False when there is none left."""
+        entries = self._entries
+        if len(entries) < 2:
+            return False
+        is_keyframe, data = entries.pop()
+        self.size -= len(data)
+        if is_keyframe:
+            # the previous frame sits at the end of the group before, replay it from its keyframe
+            previous = self._rebuild()
+        else:
+            previous = self._last.copy()
+            _apply(previous, data)
+            self._since_keyframe -= 1
+        self._last = previous
+        self.core.load_state(previous.tobytes())
+        return True
+
+    def _rebuild(self) -> np.ndarray:
+        entries = self._entries
+        first = len(entries) - 1
+        while not entries[first][0]:
+            first -= 1
+        state = np.frombuffer(entries[first][1], dtype=np.uint8).copy()
+        for index in range(first + 1, len(entries)):
+            _apply(state, entries[index][1])
+        self._since_keyframe = len(entries) - first
+        return state
+
+    def _evict(self) -> None:
+        entries = self._entries
+        while self.size > self.max_bytes and len(entries) > self._since_keyframe:
+            # drop the oldest keyframe and its deltas, never the group being recorded into
+            _, data = entries.popleft()
+            self.size -= len(data)
+            while entries and not entries[0][0]:
+                _, data = entries.popleft()
+                self.size -= len(data)
@@ -0,0 +1,235 @@
+import math
+import time
+from collections import deque
+
+TIMER_HZ = 60
+
+
+class Scheduler:
+    """Owns emulated time for the interactive loop.
+
+    Emulated time moves in ticks of 1/TIMER_HZ s. A tick runs clock / TIMER_HZ
+    instructions (the fraction carries over to the next tick) and then decrements
+    the timers once, so game timing only depends on the tick count. The mode decides
+    how many ticks update() runs per host frame:
+
+        "realtime"      the host time passed since the last update, accumulated so it never drifts
+        "fast_forward"  `speed` times that, but no more than fit in `slice_time`
+        "uncapped"      as many as fit in `slice_time` seconds of host time
+    """
+    MODES = ("realtime", "fast_forward", "uncapped")
+    MAX_CATCH_UP: float = 0.25 # host seconds made up at most after a stall, e.g. a window drag
+    STATS_WINDOW: int = TIMER_HZ * 2 # frames the ips / jitter figures are taken over
+
+    def __init__(
+        self,
+        core: object,
+        clock: int = 500,
+        mode: str = "realtime",
+        speed: float = 4.0,
+        slice_time: float = 0.75 / TIMER_HZ,
+    ) -> None:
+        self.core: object = core
+        self.clock: int = clock
+        self.mode: str = "realtime"
+        self.speed: float = speed
+        self.slice_time: float = slice_time
+        self.ticks: int = 0
+        self.instructions: int = 0
+        self.dropped_ticks: float = 0.0 # emulated frames given up because the host fell too far behind
+        self._credit: float = 0.0 # instructions owed to the next tick
+        self._accumulator: float = 0.0 # host seconds not yet turned into ticks
+        self._last: float | None = None
+        self._intervals: deque = deque(maxlen=self.STATS_WINDOW) # host seconds between updates
+        self._samples: deque = deque(maxlen=self.STATS_WINDOW) # (host time, instructions)
+        self.set_mode(mode)
+
+    def set_clock(self, clock: int) -> None:
+        """Instructions per emulated second, takes effect on the next tick."""
+        self.clock = clock
+
+    def set_mode(self, mode: str) -> None:
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown scheduler mode {mode!r}, expected one of {self.MODES}")
+        self.mode = mode
+
+    def resync(self) -> None:
+        """Forget the host time base, call after a pause so it is not caught up on."""
+        self._last = None
+        self._accumulator = 0.0
+
+    def tick(self) -> int:
+        """One emulated 1/60 s: run its instructions, then tick the timers. Returns instructions executed."""
+        core = self.core
+        self._credit += self.clock / TIMER_HZ
+        budget = int(self._credit)
+        # cycles spent waiting for a key or stopped on an error are gone, like on real hardware
+        self._credit -= budget
+        executed = core.run(budget) if budget > 0 else 0
+        core.update_timer()
+        self.ticks += 1
+        self.instructions += executed
+        return executed
+
+    def update(self) -> int:
+        """Call once per host frame, runs the ticks that are due. Returns how many ran."""
+        now = time.perf_counter()
+        if self._last is None:
+            elapsed = 1 / TIMER_HZ
+        else:
+            elapsed = now - self._last
+            self._intervals.append(elapsed)
+        self._last = now
+
+        core = self.core
+        ticks = 0
+        if self.mode == "uncapped":
+            deadline = now + self.slice_time
+            while True:
+                self.tick()
+                ticks += 1
+                if core._is_waiting_key or core._is_exceptions or time.perf_counter() >= deadline:
+                    break
+        else:
+            fast_forward = self.mode == "fast_forward"
+            scale = self.speed if fast_forward else 1.0
+            if elapsed > self.MAX_CATCH_UP:
+                self.dropped_ticks += (elapsed - self.MAX_CATCH_UP) * scale * TIMER_HZ
+                elapsed = self.MAX_CATCH_UP
+            self._accumulator += elapsed * scale
+            tick_time = 1 / TIMER_HZ
+            deadline = now + self.slice_time
+            while self._accumulator >= tick_time:
+                self._accumulator -= tick_time
+                self.tick()
+                ticks += 1
+                if fast_forward and time.perf_counter() >= deadline:
+                    # the host cannot keep up with `speed`, drop the backlog rather than spiral
+                    self.dropped_ticks += self._accumulator * TIMER_HZ
+                    self._accumulator = 0.0
+                    break
+        self._samples.append((now, self.instructions))
+        return ticks
+
+    @property
+    def ips(self) -> float:
+        """Instructions per host second over the last STATS_WINDOW frames."""
+        if len(self._samples) < 2:
+            return 0.0
+        (start, first), (end, last) = self._samples[0], self._samples[-1]
+        return (last - first) / (end - start) if end > start else 0.0
+
+    @property
+    def fps(self) -> float:
+        if not self._intervals:
+            return 0.0
+        return len(self._intervals) / sum(self._intervals)
+
+    @property
+    def jitter(self) -> float:
+        """Standard deviation of the frame intervals, in seconds."""
+        count = len(self._intervals)
+        if count < 2:
+            return 0.0
+        mean = sum(self._intervals) / count
+        return math.sqrt(sum((interval - mean) ** 2 for interval in self._intervals) / count)
+
+    def stats(self) -> dict:
+        return {
+            "ips": self.ips,
+            "fps": self.fps,
+            "jitter_ms": self.jitter * 1000,
+            "ticks": self.ticks,
+            "instructions": self.instructions,
+            "dropped_ticks": int(self.dropped_ticks),
+        }
+
+
+class FrameMonitor:
+    """Host time per frame phase (input, emulate, render, wait) and adaptive render skipping.
+
+    "wait" is the frame pacing sleep and does not count as work. If input + emulation
+    + rendering no longer fit in `frame_time`, only every
+    render_interval-th frame is drawn (up to MAX_RENDER_INTERVAL), leaving the time
+    to the emulation so the emulated speed holds. It draws more often again once
+    the frames fit in HEADROOM of the budget.
+    """
+    PHASES = ("input", "emulate", "render", "wait")
+    MAX_RENDER_INTERVAL: int = 4
+    HEADROOM: float = 0.75
+    ADJUST_EVERY: int = TIMER_HZ // 2 # frames between render_interval changes, so it does not flap
+    REPORT_TIME: float = 0.5 # seconds between HUD refreshes, keeps the text readable
+
+    def __init__(self, frame_time: float = 1 / TIMER_HZ, window: int = TIMER_HZ, clock: object = time.perf_counter) -> None:
+        self.frame_time: float = frame_time
+        self.clock: object = clock # seconds, swappable for a fake clock
+        self.render_interval: int = 1
+        self.frames: int = 0
+        self.dropped_frames: int = 0 # frames emulated but not drawn
+        # seconds per drawn frame, skipped frames would pull the averages down with no render cost
+        self.times: dict = {phase: deque(maxlen=window) for phase in self.PHASES}
+        self._current: dict = dict.fromkeys(self.PHASES, 0.0)
+        self._phase: str | None = None
+        self._mark: float = 0.0
+        self._rendering: bool = True
+        self._since_adjust: int = 0
+        self._hud: list = []
+        self._hud_time: float = 0.0
+
+    def start(self, phase: str | None) -> None:
+        """Start timing `phase`, ending the current one. None just ends it."""
+        now = self.clock()
+        if self._phase is not None:
+            self._current[self._phase] += now - self._mark
+        self._phase = phase
+        self._mark = now
+
+    def should_render(self) -> bool:
+        """Whether this frame gets drawn, counts it as dropped if not."""
+        self._rendering = self.frames % self.render_interval == 0
+        if not self._rendering:
+            self.dropped_frames += 1
+        return self._rendering
+
+    def end_frame(self) -> None:
+        self.start(None)
+        for phase, spent in self._current.items():
+            if self._rendering:
+                self.times[phase].append(spent)
+            self._current[phase] = 0.0
+        self.frames += 1
+        self._since_adjust += 1
+        if self._since_adjust >= self.ADJUST_EVERY:
+            self._since_adjust = 0
+            self._adjust()
+
+    def average(self, phase: str) -> float:
+        """Mean seconds spent in `phase` per drawn frame."""
+        times = self.times[phase]
+        return sum(times) / len(times) if times else 0.0
+
+    def _adjust(self) -> None:
+        work = self.average("input") + self.average("emulate")
+        render = self.average("render")
+        interval = self.render_interval
+        if work + render / interval > self.frame_time and interval < self.MAX_RENDER_INTERVAL:
+            self.render_interval = interval + 1
+        elif interval > 1 and work + render / (interval - 1) < self.frame_time * self.HEADROOM:
+            self.render_interval = interval - 1
+
+    def hud(self, scheduler: Scheduler) -> list:
+        """Short lines for the info panel, refreshed every REPORT_TIME seconds."""
+        now = self.clock()
+        if now - self._hud_time >= self.REPORT_TIME or not self._hud:
+            self._hud_time = now
+            self._hud = [
+                f"IPS  {scheduler.ips / 1000:.1f}k",
+                f"FPS  {scheduler.fps:.0f}",
+                f"INP  {self.average('input') * 1000:.1f}ms",
+                f"EMU  {self.average('emulate') * 1000:.1f}ms",
+                f"DRW  {self.average('render') * 1000:.1f}ms",
+                f"DRAW 1/{self.render_interval}",
+                f"DROP {self.dropped_frames}",
+                f"LAG  {int(scheduler.dropped_ticks)}",
+            ]
+        return self._hud
@@ -0,0 +1,231 @@
+# Basic-block translation cache.
+#
+# A block is the straight-line run of instructions starting at some PC, up to and
+# including the next jump, skip, call, return, key wait or memory store. Each block
+# is compiled once into a Python function and cached by its start address:
+#
+#   def block(core, budget=5):
+#       v = core._v
+#       if budget >= 5:
+#           core.history.extend(entries)  # only when history is on
+#           ...                 # inlined register / timer / index operations
+#           h3(core, 0x1, 0x2)  # handlers that are not worth inlining
+#           core._pc = 0x204
+#           return 5            # instructions executed
+#       core.history.extend(entries[:budget])
+#       ...                     # the same body, with an exit after every instruction:
+#       if budget == 2:
+#           core._pc = 0x1FC
+#           return 2
+#
+# The budget lets run() execute a block that is longer than the instructions it has
+# left, e.g. the ~8 per frame at 500 Hz, without falling back to single table steps.
+#
+# Memory.write_hook reports every store, any block whose address range is written
+# gets dropped and is translated again the next time the PC reaches it.
+
+INLINE = 0 # falls through, PC not updated yet
+CALL = 1 # falls through, the handler already moved the PC
+END = 2 # ends the block, PC already set
+
+
+class Translator:
+    MAX_BLOCK_LENGTH: int = 64
+
+    def __init__(self, core: object) -> None:
+        self.core: object = core
+        self._blocks: dict = {} # start address -> (function, length, end address)
+        self._owners: dict = {} # address -> set of block start addresses covering it
+        core.memory.write_hook = self.invalidate
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def lookup(self, pc: int) -> tuple:
+        """Returns (function, length) for the block starting at pc, translating it if needed."""
+        block = self._blocks.get(pc)
+        if block is None:
+            block = self._translate(pc)
+        return block[0], block[1]
+
+    def invalidate(self, start: int, end: int) -> None:
+        """Drops every block that covers an address in [start, end)."""
+        owners = self._owners
+        if not owners:
+            return
+        addresses = range(start, end)
+        if len(addresses) > len(owners):
+            # big writes (ROM loads, state restores), walk the covered addresses instead
+            addresses = [address for address in owners if start <= address < end]
+        for address in addresses:
+            starts = owners.get(address)
+            if starts:
+                for block_start in tuple(starts):
+                    self._drop(block_start)
+
+    def flush(self) -> None:
+        self._blocks.clear()
+        self._owners.clear()
+
+    def _drop(self, start: int) -> None:
+        block = self._blocks.pop(start, None)
+        if block is None:
+            return
+        for address in range(start, block[2]):
+            starts = self._owners.get(address)
+            if starts is not None:
+                starts.discard(start)
+                if not starts:
+                    del self._owners[address]
+
+    def _translate(self, start: int) -> tuple:
+        memory = self.core.memory
+        size = len(memory)
+        read_word = memory.read_word
+        namespace = {}
+        body = []
+        opcodes = []
+        ends = [] # (length of body, kind) after each instruction
+        address = start
+        kind = INLINE
+        while len(opcodes) < self.MAX_BLOCK_LENGTH and address + 1 < size:
+            opcode = read_word(address)
+            opcodes.append(opcode)
+            kind = self._emit(opcode, address, body, namespace)
+            ends.append((len(body), kind))
+            address += 2
+            if kind == END:
+                break
+
+        if not opcodes:
+            # Nothing decodable here, let the regular path raise the same error it always did.
+            def block(core: object, budget: int = 1) -> int:
+                return core._step()
+            entry = (block, 1, start + 2)
+            self._blocks[start] = entry
+            return entry
+
+        if kind == INLINE:
+            body.append(f"core._pc = 0x{address:03X}")
+
+        length = len(opcodes)
+        history = self.core.history is not None
+        namespace["entries"] = tuple((opcode, start + 2 * offset) for offset, opcode in enumerate(opcodes))
+        source = [f"def block(core, budget={length}):", "    v = core._v", f"    if budget >= {length}:"]
+        if history:
+            source.append("        core.history.extend(entries)")
+        source.append(f"        core._current_opcode = 0x{opcodes[-1]:04X}")
+        source.extend(f"        {line}" for line in body)
+        source.append(f"        return {length}")
+        # fewer instructions left than the block holds, stop after `budget` of them
+        if history:
+            source.append("    core.history.extend(entries[:budget])")
+        line = 0
+        for count, (end, kind) in enumerate(ends[:-1], 1):
+            source.extend(f"    {statement}" for statement in body[line:end])
+            line = end
+            source.append(f"    if budget == {count}:")
+            if kind == INLINE:
+                source.append(f"        core._pc = 0x{start + 2 * count:03X}")
+            source.append(f"        core._current_opcode = 0x{opcodes[count - 1]:04X}")
+            source.append(f"        return {count}")
+        # budget < 1, run() never asks for that
+        source.append("    return 0")
+        exec(compile("\n".join(source), f"<block 0x{start:03X}>", "exec"), namespace)
+
+        entry = (namespace["block"], length, address)
+        self._blocks[start] = entry
+        for covered in range(start, address):
+            self._owners.setdefault(covered, set()).add(start)
+        return entry
+
+    def _emit(self, opcode: int, address: int, body: list, namespace: dict) -> int:
+        msn = opcode >> 12
+        x = opcode >> 8 & 0x0F
+        y = opcode >> 4 & 0x0F
+        kk = opcode & 0x00FF
+        n = opcode & 0x000F
+        nnn = opcode & 0x0FFF
+        skip = f"0x{address + 4:03X}"
+        step = f"0x{address + 2:03X}"
+
+        if msn == 0x1:
+            body.append(f"core._pc = 0x{nnn:03X}")
+            return END
+        if msn == 0x3:
+            body.append(f"core._pc = {skip} if v[{x}] == {kk} else {step}")
+            return END
+        if msn == 0x4:
+            body.append(f"core._pc = {skip} if v[{x}] != {kk} else {step}")
+            return END
+        if msn == 0x5:
+            body.append(f"core._pc = {skip} if v[{x}] == v[{y}] else {step}")
+            return END
+        if msn == 0x9:
+            body.append(f"core._pc = {skip} if v[{x}] != v[{y}] else {step}")
+            return END
+        if msn == 0x6:
+            body.append(f"v[{x}] = {kk}")
+            return INLINE
+        if msn == 0x7:
+            body.append(f"v[{x}] = (v[{x}] + {kk}) & 0xFF")
+            return INLINE
+        if msn == 0x8 and n <= 0x5 or msn == 0x8 and n == 0x7:
+            if n == 0x0:
+                body.append(f"v[{x}] = v[{y}]")
+            elif n == 0x1:
+                body.append(f"v[{x}] = v[{x}] | v[{y}]")
+            elif n == 0x2:
+                body.append(f"v[{x}] = v[{x}] & v[{y}]")
+            elif n == 0x3:
+                body.append(f"v[{x}] = v[{x}] ^ v[{y}]")
+            elif n == 0x4:
+                body.append(f"add = v[{x}] + v[{y}]")
+                body.append("v[15] = 1 if add > 0xFF else 0")
+                body.append(f"v[{x}] = add & 0xFF")
+            elif n == 0x5:
+                body.append(f"v[15] = 1 if v[{x}] >= v[{y}] else 0")
+                body.append(f"v[{x}] = (v[{x}] - v[{y}]) & 0xFF")
+            else:
+                body.append(f"v[15] = 1 if v[{y}] >= v[{x}] else 0")
+                body.append(f"v[{x}] = (v[{y}] - v[{x}]) & 0xFF")
+            return INLINE
+        if msn == 0xa:
+            body.append(f"core._i = 0x{nnn:03X}")
+            return INLINE
+        if msn == 0xf and kk == 0x07:
+            body.append(f"v[{x}] = core._dt")
+            return INLINE
+        if msn == 0xf and kk == 0x15:
+            body.append(f"core._dt = v[{x}]")
+            return INLINE
+        if msn == 0xf and kk == 0x18:
+            body.append(f"core._st = v[{x}]")
+            return INLINE
+        if msn == 0xf and kk == 0x1e:
+            body.append(f"add = core._i + v[{x}]")
+            body.append("v[15] = 1 if add > 0xFFF else 0")
+            body.append("core._i = add & 0x0FFF")
+            return INLINE
+        if msn == 0xf and kk == 0x29:
+            body.append(f"core._i = (v[{x}] * 5) & 0x0FFF")
+            return INLINE
+
+        # Everything else goes through its regular handler.
+        handler, operands = self.core._opcode_table[opcode]
+        name = f"h{len(namespace)}"
+        namespace[name] = handler
+        arguments = "".join(f", {operand!r}" for operand in operands)
+        body.append(f"core._pc = 0x{address:03X}")
+        body.append(f"{name}(core{arguments})")
+
+        if msn in (0x0, 0x2, 0xb, 0xe):
+            # calls, returns, computed jumps, key skips and SYS / unknown opcodes
+            if opcode != 0x00e0:
+                return END
+        elif msn == 0xf and kk in (0x0a, 0x33, 0x55):
+            # key wait, or a store that may overwrite the code we are running
+            return END
+        elif handler is self.core._execute_unknown.__func__:
+            return END
+        return CALL
@@ -0,0 +1,82 @@
+"""Gym-style environment for driving a ROM from agent code.
+
+    env = Chip8Env("GAMES/PONG", frame_skip=4)
+    observation, info = env.reset()
+    observation, info = env.step(1 << 0x4)  # hold key 4 for the next 4 frames
+"""
+import numpy as np
+
+from core.core import Core
+from headless import make_core, CHIP8_CLOCK_HZ, TARGET_FPS
+
+
+class Chip8Env:
+    """Wraps a headless Core.
+
+    step(action) takes a 16 bit mask of the keypad keys held down, bit k is key k,
+    then runs `frame_skip` frames of `cycles_per_frame` instructions without rendering.
+    The observation is a read-only view of the display pixels (pixels[y, x], bool), it
+    is the same array on every call and updates in place. info is also reused, copy
+    either if you need to keep them. Nothing is allocated per step.
+    """
+
+    def __init__(
+        self,
+        rom: str | bytes,
+        frame_skip: int = 4,
+        clock: int = CHIP8_CLOCK_HZ,
+        dispatch: str = "translate",
+    ) -> None:
+        if isinstance(rom, str):
+            with open(rom, "rb") as file:
+                rom = file.read()
+        self.frame_skip: int = frame_skip
+        self.cycles_per_frame: int = clock // TARGET_FPS
+        # the packed framebuffer unpacks a new array on every read, so observations need "array"
+        self.core: Core = make_core(dispatch, framebuffer="array")
+        self.core.write_rom(rom)
+        self.core._is_rom_loaded = True
+        self._initial_state: bytes = self.core.save_state() # power-on state, restored by reset()
+        self._keys: bytearray = self.core.keyboard.keys
+
+        self.observation: np.ndarray = self.core.display.pixels.view()
+        self.observation.flags.writeable = False
+        self.info: dict = {"frame": 0, "instructions": 0, "waiting_key": False, "exception": ""}
+        self._result: tuple = (self.observation, self.info)
+
+    def reset(self) -> tuple:
+        """Restart the ROM, returns (observation, info)."""
+        self.core.load_state(self._initial_state)
+        self._keys[:16] = bytes(16)
+        info = self.info
+        info["frame"] = 0
+        info["instructions"] = 0
+        info["waiting_key"] = False
+        info["exception"] = ""
+        return self._result
+
+    def step(self, action: int) -> tuple:
+        """Hold the keys in the `action` bit mask for frame_skip frames, returns (observation, info)."""
+        core = self.core
+        keys = self._keys
+        for key in range(16):
+            keys[key] = action >> key & 1
+
+        executed = 0
+        for _ in range(self.frame_skip):
+            if core._is_exceptions:
+                break
+            if core._is_waiting_key:
+                pressed_key = core.keyboard.get_held_down_value()
+                if pressed_key is not None:
+                    core.resume_with_key(pressed_key)
+            else:
+                executed += core.run(self.cycles_per_frame)
+            core.update_timer()
+
+        info = self.info
+        info["frame"] += self.frame_skip
+        info["instructions"] += executed
+        info["waiting_key"] = core._is_waiting_key
+        info["exception"] = core._exceptions
+        return self._result
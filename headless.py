@@ -0,0 +1,296 @@
+#!/usr/bin python3
+"""Run a ROM without a window, as fast as possible or at real-time speed.
+
+    python headless.py run GAMES/PONG --frames 600 --uncapped
+    python -m headless run GAMES/PONG --cycles 1000000 --dispatch translate --uncapped
+    python headless.py run GAMES/PONG --profile pong_profile.json --profile-timing
+    python headless.py farm GAMES/ --frames 600 --checkpoints 60,300 --report report.csv
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.memory import Memory
+from core.decoder import Decoder
+from core.core import Core
+from core.library import RomLibrary, analyze_rom
+from core.profiler import Profiler
+from peripherals.null import NullDisplay, NullKeyboard
+
+DEFAULT_FRAME_W = 64
+DEFAULT_FRAME_H = 32
+TARGET_FPS = 60
+CHIP8_CLOCK_HZ = 500
+
+
+def make_core(dispatch: str = "translate", history: int = 0, framebuffer: str = "array") -> Core:
+    """Core wired to a NullDisplay and NullKeyboard."""
+    display = NullDisplay(DEFAULT_FRAME_W, DEFAULT_FRAME_H, framebuffer)
+    core = Core(Memory(), Decoder(), NullKeyboard(), display)
+    core.set_history_depth(history)
+    core.select_dispatch(dispatch)
+    return core
+
+
+def framebuffer_hash(core: Core) -> str:
+    return hashlib.sha1(core.display.framebuffer.tobytes()).hexdigest()
+
+
+def run_frames(
+    core: Core,
+    frames: int | None = None,
+    cycles: int | None = None,
+    cycles_per_frame: int = CHIP8_CLOCK_HZ // TARGET_FPS,
+    fps: int | None = None,
+    inputs: dict | None = None,
+    checkpoints: set | None = None,
+) -> tuple:
+    """Run until `frames` frames or `cycles` instructions, whichever comes first.
+    Timers tick once per frame. fps=None runs uncapped, otherwise frames are paced in real time.
+    inputs maps a frame number to [(key, is_down), ...] applied at the start of that frame.
+    Returns (instructions executed, frames run, {checkpoint frame: framebuffer hash}).
+    """
+    keyboard = core.keyboard
+    last_input = max(inputs) if inputs else -1
+    hashes = {}
+    executed = 0
+    frame = 0
+    frame_time = 1 / fps if fps else 0.0
+    next_frame = time.perf_counter()
+    while (frames is None or frame < frames) and (cycles is None or executed < cycles):
+        if core._is_exceptions:
+            break
+        keyboard.update_key_state()
+        if inputs and frame in inputs:
+            for key, is_down in inputs[frame]:
+                if is_down:
+                    keyboard.press(key)
+                else:
+                    keyboard.release(key)
+
+        if core._is_waiting_key:
+            pressed_key = keyboard.get_held_down_value()
+            if pressed_key is not None:
+                core.resume_with_key(pressed_key)
+            elif frame >= last_input:
+                # nothing is ever going to press a key
+                break
+        else:
+            budget = cycles_per_frame if cycles is None else min(cycles_per_frame, cycles - executed)
+            executed += core.run(budget)
+        core.update_timer()
+        frame += 1
+        if checkpoints and frame in checkpoints:
+            hashes[frame] = framebuffer_hash(core)
+        if frame_time:
+            next_frame += frame_time
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    return executed, frame, hashes
+
+
+def parse_inputs(presses: list) -> dict:
+    """["60:b", "90:5:10"] -> hold key 0xB for 1 frame at frame 60, key 0x5 for 10 frames at frame 90."""
+    inputs = {}
+    for press in presses:
+        fields = press.split(":")
+        frame = int(fields[0])
+        key = int(fields[1], 16)
+        length = int(fields[2]) if len(fields) > 2 else 1
+        inputs.setdefault(frame, []).append((key, True))
+        inputs.setdefault(frame + length, []).append((key, False))
+    return inputs
+
+
+def run_rom(path: str, frames: int, checkpoints: tuple, inputs: dict, dispatch: str, clock: int, info: dict) -> dict:
+    """Farm worker: run one ROM headless with the quirks in `info` (see core.library) and return its results."""
+    result = {
+        "rom": os.path.basename(path),
+        "size": os.path.getsize(path),
+        "platform": info["platform"],
+        "instructions": 0,
+        "frames": 0,
+        "wall_time": 0.0,
+        "pc": None,
+        "exception": "",
+        "hashes": {},
+        "final_hash": None,
+    }
+    start = time.perf_counter()
+    try:
+        core = make_core(dispatch)
+        core.shift_use_vy = info["shift_use_vy"]
+        core.increment_i = info["increment_i"]
+        with open(path, "rb") as file:
+            # write_rom() would resolve a relative path under GAMES/ again
+            core.write_rom(file.read())
+        core._is_rom_loaded = True
+        executed, frame, hashes = run_frames(
+            core,
+            frames=frames,
+            cycles_per_frame=clock // TARGET_FPS,
+            inputs=inputs,
+            checkpoints=set(checkpoints),
+        )
+        result["instructions"] = executed
+        result["frames"] = frame
+        result["pc"] = f"{core._pc:04X}"
+        result["exception"] = core._exceptions
+        result["hashes"] = hashes
+        result["final_hash"] = framebuffer_hash(core)
+    except Exception as error:
+        # a broken ROM must not take the whole run down
+        result["exception"] = f"{type(error).__name__}: {error}"
+    result["wall_time"] = time.perf_counter() - start
+    return result
+
+
+def write_report(results: list, path: str) -> None:
+    if path.endswith(".csv"):
+        fields = ["rom", "size", "platform", "instructions", "frames", "wall_time", "pc", "exception", "final_hash", "hashes"]
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=fields)
+            writer.writeheader()
+            for result in results:
+                row = dict(result)
+                row["hashes"] = " ".join(f"{frame}:{digest}" for frame, digest in sorted(result["hashes"].items()))
+                writer.writerow(row)
+    else:
+        with open(path, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+def command_run(args: argparse.Namespace) -> None:
+    core = make_core(args.dispatch, args.history, args.framebuffer)
+    try:
+        with open(args.rom, "rb") as file:
+            rom = file.read()
+        core.write_rom(rom)
+    except (OSError, ValueError) as error:
+        # printed to stderr, exit status 1
+        raise SystemExit(f"Could not load {args.rom}: {error}")
+    info = analyze_rom(rom)
+    core.shift_use_vy = info["shift_use_vy"]
+    core.increment_i = info["increment_i"]
+    clock = args.clock or info["clock"]
+    core._is_rom_loaded = True
+
+    frames = args.frames
+    if frames is None and args.cycles is None:
+        frames = TARGET_FPS * 10
+
+    profiler = None
+    if args.profile:
+        profiler = Profiler(core, timing=args.profile_timing)
+        profiler.start()
+    start = time.perf_counter()
+    executed, frame, _ = run_frames(
+        core,
+        frames=frames,
+        cycles=args.cycles,
+        cycles_per_frame=clock // TARGET_FPS,
+        fps=None if args.uncapped else TARGET_FPS,
+        inputs=parse_inputs(args.press),
+    )
+    elapsed = time.perf_counter() - start
+    if profiler is not None:
+        profiler.stop()
+
+    print(f"instructions: {executed}")
+    print(f"frames:       {frame}")
+    print(f"elapsed:      {elapsed:.3f} s")
+    print(f"ips:          {executed / elapsed if elapsed else 0:,.0f}")
+    print(f"platform:     {info['platform']}")
+    print(f"pc:           {core._pc:04X}")
+    print(f"framebuffer:  {framebuffer_hash(core)}")
+    if core._is_waiting_key:
+        print("stopped:      waiting for a key")
+    if core._is_exceptions:
+        print(f"exception:    {core._exceptions}")
+    if profiler is not None:
+        profiler.save_json(args.profile)
+        print()
+        print(profiler.report())
+
+
+def command_farm(args: argparse.Namespace) -> None:
+    directory = args.directory or make_core().read_path()
+    library = RomLibrary(directory)
+    library.refresh()
+    roms = library.names()
+    checkpoints = tuple(int(frame) for frame in args.checkpoints.split(",") if frame)
+    inputs = parse_inputs(args.press)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(
+                run_rom,
+                os.path.join(directory, rom),
+                args.frames,
+                checkpoints,
+                inputs,
+                args.dispatch,
+                args.clock or library.info(rom)["clock"],
+                library.info(rom),
+            )
+            for rom in roms
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    write_report(results, args.report)
+    total = sum(result["instructions"] for result in results)
+    failed = [result for result in results if result["exception"]]
+    for result in failed:
+        print(f"{result['rom']}: {result['exception']}")
+    print(f"{len(results)} ROMs, {len(failed)} with exceptions, {total:,} instructions in {elapsed:.2f} s")
+    print(f"report: {args.report}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="headless", description="Headless CHIP-8 runner")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run a ROM and print statistics")
+    run.add_argument("rom", help="path to the ROM file")
+    run.add_argument("--cycles", type=int, default=None, help="stop after N instructions")
+    run.add_argument("--frames", type=int, default=None, help="stop after N frames (default 600)")
+    run.add_argument("--uncapped", action="store_true", help=f"do not pace frames to {TARGET_FPS} FPS")
+    run.add_argument("--clock", type=int, default=None, help="instructions per second (default suggested for the ROM)")
+    run.add_argument("--dispatch", choices=("decoder", "table", "translate"), default="translate")
+    run.add_argument("--history", type=int, default=0, help="opcode history depth, 0 is off")
+    run.add_argument("--framebuffer", choices=("array", "packed"), default="array")
+    run.add_argument("--profile", default=None, metavar="PATH",
+                     help="count instructions per handler and PC, write them to PATH as JSON and print a report")
+    run.add_argument("--profile-timing", action="store_true", help="with --profile, also time sampled handlers")
+    run.add_argument("--press", action="append", default=[], metavar="FRAME:KEY[:FRAMES]",
+                     help="hold a key (hex) from a frame, may be repeated")
+    run.set_defaults(handler=command_run)
+
+    farm = commands.add_parser("farm", help="run every ROM in a directory across a process pool")
+    farm.add_argument("directory", nargs="?", default=None, help="ROM directory (default GAMES/)")
+    farm.add_argument("--frames", type=int, default=TARGET_FPS * 10, help="frames per ROM")
+    farm.add_argument("--checkpoints", default="", help="comma separated frames to hash, e.g. 60,300")
+    farm.add_argument("--press", action="append", default=[], metavar="FRAME:KEY[:FRAMES]",
+                      help="scripted input applied to every ROM, may be repeated")
+    farm.add_argument("--workers", type=int, default=None, help="processes (default all cores)")
+    farm.add_argument("--clock", type=int, default=None, help="instructions per second (default suggested per ROM)")
+    farm.add_argument("--dispatch", choices=("decoder", "table", "translate"), default="translate")
+    farm.add_argument("--report", default="farm_report.json", help="output .json or .csv")
+    farm.set_defaults(handler=command_farm)
+    return parser
+
+
+def main(argv: list | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
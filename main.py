@@ -1,28 +1,15 @@
 #!/usr/bin python3
-from pyray import (
-    init_window,
-    begin_drawing,
-    window_should_close,
-    close_window,
-    clear_background,
-    end_drawing,
-    set_target_fps,
-    draw_rectangle_lines_ex,
-    draw_text,
-    Rectangle,
-    BLACK,
-    GREEN,
-    RED
-)
+import argparse
+import os
 
 from core.memory import Memory
 from core.decoder import Decoder
 from core.core import Core
-from peripherals.display import Display
-from peripherals.keyboard import Keyboard
+from core.rewind import Rewind
+from core.scheduler import FrameMonitor, Scheduler
+from peripherals.backends import FRONTENDS, create_frontend
+from peripherals.base import KEY_SAVE_STATE, KEY_LOAD_STATE, KEY_NEXT_SLOT, KEY_REWIND, KEY_TURBO
 
-MAIN_DISPLAY_W = 644
-MAIN_DISPLAY_H = 720
 MAX_FRAME_BUFFER_W = 640
 MAX_FRAME_BUFFER_H = 360
 DEFAULT_FRAME_W = 64
@@ -30,101 +17,178 @@ DEFAULT_FRAME_H = 32
 
 # --- New constants for decoupling ---
 TARGET_FPS = 60
-CHIP8_CLOCK_HZ = 500
-CYCLES_PER_FRAME = CHIP8_CLOCK_HZ // TARGET_FPS
+CHIP8_CLOCK_HZ = 500 # default clock, ROMs in the library suggest their own
+TURBO_SPEED = 4 # while the turbo key is held, unless --turbo says otherwise
+
+SAVE_SLOTS = 10
+REWIND_KEYFRAME_INTERVAL = TARGET_FPS # one full snapshot a second, deltas in between
+REWIND_MAX_BYTES = 16 * 1024 * 1024
+
+
+def state_path(core: Core, rom_name: str, slot: int) -> str:
+    """SAVES/<rom>.<slot>.state, next to the GAMES directory."""
+    games = os.path.normpath(core.read_path())
+    return os.path.join(os.path.dirname(games), "SAVES", f"{rom_name}.{slot}.state")
+
+
+def main(argv: list | None = None):
+    parser = argparse.ArgumentParser(description="Chip 8 Emulator")
+    parser.add_argument("--frontend", choices=FRONTENDS, default="raylib")
+    parser.add_argument("--clock", type=int, default=None, help="instructions per second (default suggested per ROM)")
+    parser.add_argument("--uncapped", action="store_true", help="run the emulation as fast as the host allows")
+    parser.add_argument("--turbo", type=float, default=None, metavar="N",
+                        help=f"run at N times speed all the time (the turbo key uses N too, default {TURBO_SPEED})")
+    args = parser.parse_args(argv)
 
-def main():
     w_ratio = MAX_FRAME_BUFFER_W // DEFAULT_FRAME_W
     h_ratio = MAX_FRAME_BUFFER_H // DEFAULT_FRAME_H
     s_ratio = min(w_ratio, h_ratio)
 
-    init_window(MAIN_DISPLAY_W, MAIN_DISPLAY_H, "Chip 8 Emulator")
-    set_target_fps(TARGET_FPS)
-    display = Display(DEFAULT_FRAME_W, DEFAULT_FRAME_H, s_ratio, GREEN)
+    display, keyboard = create_frontend(args.frontend, DEFAULT_FRAME_W, DEFAULT_FRAME_H, s_ratio)
+    display.open("Chip 8 Emulator", TARGET_FPS)
     memory = Memory()
     decoder = Decoder()
-    keyboard = Keyboard()
     core = Core(memory, decoder, keyboard, display)
     roms, str_len = core.read_rom()
-    core_frame = Rectangle(1, 1, MAX_FRAME_BUFFER_W + 2, MAX_FRAME_BUFFER_H + 2)
-    info_frame = Rectangle(1, 364, MAX_FRAME_BUFFER_W + 2, MAX_FRAME_BUFFER_H - 5)
+    rewind = Rewind(core, REWIND_KEYFRAME_INTERVAL, REWIND_MAX_BYTES)
+    if args.uncapped:
+        base_mode = "uncapped"
+    elif args.turbo:
+        base_mode = "fast_forward"
+    else:
+        base_mode = "realtime"
+    scheduler = Scheduler(core, args.clock or CHIP8_CLOCK_HZ, base_mode, speed=args.turbo or TURBO_SPEED)
+    monitor = FrameMonitor(1 / TARGET_FPS)
 
     pos_x = 0
     pos_y = 0
     is_pause = False  
-    while not window_should_close():
-        keyboard.update_key_state()
-        if not is_pause and keyboard.is_just_pressed(0x12):
-            print("Pause")
-            is_pause = True
-        elif is_pause and keyboard.is_just_pressed(0x12):
-            print("True")
-            is_pause = False
-
-        if not core._is_rom_loaded:
-            if keyboard.is_just_pressed(0x5):
-                if pos_y >= 0:
-                    pos_y -= 1
-                if pos_y < 0:
-                    pos_y = len(roms) - 1
-            elif keyboard.is_just_pressed(0x8):
-                if pos_y <= len(roms) -1:
-                    pos_y += 1
-                if pos_y > len(roms) -1:
-                    pos_y = 0
-            elif keyboard.is_just_pressed(0x7):
-                if pos_x >= 0:
-                    pos_x -= 1
-                if pos_x < 0:
-                    pos_x = len(roms[pos_y]) - 1
-            elif keyboard.is_just_pressed(0x9):
-                if pos_x <= len(roms[pos_y]) - 1:
-                    pos_x += 1
-                if pos_x > len(roms[pos_y]) - 1:
-                    pos_x = 0
-            elif keyboard.is_just_pressed(0xb):
-                core.write_rom(roms[pos_y][pos_x])
-                core._is_rom_loaded = True
-                display.clear_screen()
-                continue
-            display.render_selection(roms, str_len, pos_x, pos_y)
-        else:
-            if keyboard.is_just_pressed(0x10):
-                core.reset()
-                memory.clear()
-                display.clear_screen()
-
-            # --- The Decoupling Loop ---
-            if not core._is_exceptions:
-                if core._is_waiting_key:
-                    pressed_key = keyboard.get_held_down_value()
-                    if pressed_key is not None:
-                        core._v[core._pressed_key] = pressed_key
-                        core._is_waiting_key = False
-                        core._pc += 2
-                else:
-                    for _ in range(CYCLES_PER_FRAME):
-                        if not is_pause:
-                            core.cycle()
-                            core.update_timer()
-        
-        begin_drawing()
-        clear_background(BLACK)
-        draw_rectangle_lines_ex(core_frame, 1.0, GREEN)
-        draw_rectangle_lines_ex(info_frame, 1.0, GREEN)
-
-        if core._is_rom_loaded:
-            display.render()
-            if core._is_exceptions:
-                draw_text("An Error Occured:", 10, 400, 20, RED)
-                draw_text(f"{core._exceptions}", 10, 420, 20, RED)
-                draw_text("Pressed C to Continue")
+    rom_name = ""
+    slot = 0
+    try:
+        while not display.should_close():
+            monitor.start("input")
+            keyboard.update_key_state()
+            if not is_pause and keyboard.is_just_pressed(0x12):
+                print("Pause")
+                is_pause = True
+            elif is_pause and keyboard.is_just_pressed(0x12):
+                print("True")
+                is_pause = False
 
+            if not core._is_rom_loaded:
+                if keyboard.is_just_pressed(0x5):
+                    if pos_y >= 0:
+                        pos_y -= 1
+                    if pos_y < 0:
+                        pos_y = len(roms) - 1
+                elif keyboard.is_just_pressed(0x8):
+                    if pos_y <= len(roms) -1:
+                        pos_y += 1
+                    if pos_y > len(roms) -1:
+                        pos_y = 0
+                elif keyboard.is_just_pressed(0x7):
+                    if pos_x >= 0:
+                        pos_x -= 1
+                    if pos_x < 0:
+                        pos_x = len(roms[pos_y]) - 1
+                elif keyboard.is_just_pressed(0x9):
+                    if pos_x <= len(roms[pos_y]) - 1:
+                        pos_x += 1
+                    if pos_x > len(roms[pos_y]) - 1:
+                        pos_x = 0
+                elif keyboard.is_just_pressed(0xb):
+                    try:
+                        core.write_rom(roms[pos_y][pos_x])
+                    except (OSError, ValueError) as error:
+                        print(f"Could not load {roms[pos_y][pos_x]}: {error}")
+                        continue
+                    rom_name = roms[pos_y][pos_x]
+                    # the quirks always come from the ROM, --clock only overrides its clock
+                    clock = core.apply_rom_settings(rom_name)
+                    scheduler.set_clock(args.clock or clock)
+                    scheduler.resync()
+                    core._is_rom_loaded = True
+                    display.clear_screen()
+                    rewind.clear()
+                    continue
+            else:
+                if keyboard.is_just_pressed(0x10):
+                    core.reset()
+                    memory.clear()
+                    display.clear_screen()
+                    rewind.clear()
+
+                if keyboard.is_just_pressed(KEY_NEXT_SLOT):
+                    slot = (slot + 1) % SAVE_SLOTS
+                    print(f"Save slot {slot}")
+                elif keyboard.is_just_pressed(KEY_SAVE_STATE):
+                    path = state_path(core, rom_name, slot)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, "wb") as file:
+                        file.write(core.save_state())
+                    print(f"Saved slot {slot}")
+                elif keyboard.is_just_pressed(KEY_LOAD_STATE):
+                    try:
+                        with open(state_path(core, rom_name, slot), "rb") as file:
+                            core.load_state(file.read())
+                        rewind.clear()
+                        scheduler.resync()
+                        print(f"Loaded slot {slot}")
+                    except (OSError, ValueError) as error:
+                        print(f"Could not load slot {slot}: {error}")
+
+                # --- The Decoupling Loop ---
+                monitor.start("emulate")
+                if keyboard.is_pressed(KEY_REWIND):
+                    # one recorded frame back per displayed frame, also leaves an exception
+                    rewind.step_back()
+                    scheduler.resync()
+                elif not core._is_exceptions:
+                    if core._is_waiting_key:
+                        pressed_key = keyboard.get_held_down_value()
+                        if pressed_key is not None:
+                            core.resume_with_key(pressed_key)
+                    if is_pause:
+                        scheduler.resync()
+                    else:
+                        # turbo only changes how many ticks run per displayed frame, rendering stays once a frame
+                        turbo = base_mode == "realtime" and keyboard.is_pressed(KEY_TURBO)
+                        scheduler.set_mode("fast_forward" if turbo else base_mode)
+                        # timers keep ticking while the ROM waits for a key
+                        scheduler.update()
+                        rewind.record()
+
+            monitor.start("render")
+            # when the host falls behind only every few frames are drawn, emulation keeps its speed
+            if not core._is_rom_loaded or monitor.should_render():
+                display.begin_frame()
+                if core._is_rom_loaded:
+                    display.render()
+                    if core._is_exceptions:
+                        display.render_exception(core._exceptions)
+                    else:
+                        display.render_info(core)
+                        display.render_opcode_history(core)
+                        display.render_performance(monitor.hud(scheduler))
+                else:
+                    display.render_selection(roms, str_len, pos_x, pos_y)
+                display.end_frame()
             else:
-                display.render_info(core)
-                display.render_opcode_history(core)
-        end_drawing()
-    close_window()
+                display.poll()
+            # pacing is its own phase, so the render time the monitor adapts to is only drawing
+            monitor.start("wait")
+            display.wait_frame()
+            monitor.end_frame()
+    finally:
+        display.close()
+        if scheduler.ticks:
+            stats = scheduler.stats()
+            print(
+                f"{stats['instructions']:,} instructions over {stats['ticks']:,} ticks, "
+                f"{stats['ips']:,.0f} ips, {stats['fps']:.1f} fps, jitter {stats['jitter_ms']:.2f} ms, "
+                f"{stats['dropped_ticks']:,} ticks lost, {monitor.dropped_frames:,} frames not drawn"
+            )
 
 
 if __name__ == "__main__":
@@ -1,2 +1,11 @@
-from . import display
-from . import keyboard
\ No newline at end of file
+import importlib
+
+from . import framebuffer
+from . import null
+
+
+def __getattr__(name: str) -> object:
+    # display and keyboard pull in pyray, only import them when they are used
+    if name in ("display", "keyboard"):
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,21 @@
+# Frontend selection. Each backend module is only imported when it is asked for,
+# so picking "terminal" or "null" never loads pyray.
+
+FRONTENDS = ("raylib", "terminal", "null")
+
+
+def create_frontend(name: str, x_axis: int, y_axis: int, s_ratio: int = 1, framebuffer: str = "array") -> tuple:
+    """Returns a (display, keyboard) pair for the named frontend."""
+    if name == "raylib":
+        from pyray import GREEN
+        from .display import Display
+        from .keyboard import Keyboard
+        return Display(x_axis, y_axis, s_ratio, GREEN, framebuffer), Keyboard()
+    if name == "terminal":
+        from .terminal import TerminalDisplay, TerminalKeyboard
+        display = TerminalDisplay(x_axis, y_axis, framebuffer)
+        return display, TerminalKeyboard(display)
+    if name == "null":
+        from .null import NullDisplay, NullKeyboard
+        return NullDisplay(x_axis, y_axis, framebuffer), NullKeyboard()
+    raise ValueError(f"Unknown frontend {name!r}, expected one of {FRONTENDS}")
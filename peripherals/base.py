@@ -0,0 +1,148 @@
+import numpy as np
+
+from .framebuffer import FRAMEBUFFERS
+
+# Keys 0x0-0xF are the CHIP-8 keypad, the rest are emulator controls.
+KEY_RESET = 0x10
+KEY_RESELECT = 0x11
+KEY_PAUSE = 0x12
+KEY_SAVE_STATE = 0x13
+KEY_LOAD_STATE = 0x14
+KEY_NEXT_SLOT = 0x15
+KEY_REWIND = 0x16
+KEY_TURBO = 0x17
+KEY_COUNT = 24
+
+
+class BaseDisplay:
+    """What Core and the main loop need from a display backend.
+
+    Holds the framebuffer, sprite drawing and change tracking are shared by every
+    backend. Backends override the window lifecycle and render_* methods, which
+    do nothing here.
+    """
+
+    def __init__(self, x_axis: int, y_axis: int, framebuffer: str = "array") -> None:
+        self.x_axis: int = x_axis
+        self.y_axis: int = y_axis
+        self.framebuffer_type: str = framebuffer # "array" or "packed", see peripherals/framebuffer.py
+        self.framebuffer: object = FRAMEBUFFERS[framebuffer](x_axis, y_axis)
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """Row-major bool array, pixels[y, x]."""
+        return self.framebuffer.pixels
+
+    @property
+    def wrap(self) -> bool:
+        """Sprites wrap around the screen edges, False clips them."""
+        return self.framebuffer.wrap
+
+    @wrap.setter
+    def wrap(self, value: bool) -> None:
+        self.framebuffer.wrap = value
+
+    @property
+    def version(self) -> int:
+        """Goes up on every framebuffer change, compare against the last version you saw."""
+        return self.framebuffer.version
+
+    def take_dirty(self) -> tuple:
+        """Returns (sorted dirty rows, dirty rect (x0, y0, x1, y1) or None) and resets them."""
+        return self.framebuffer.take_dirty()
+
+    def set_resolution(self, x_axis: int, y_axis: int) -> None:
+        """Switch resolution (e.g. 128x64 hi-res), the screen is cleared."""
+        wrap = self.framebuffer.wrap
+        version = self.framebuffer.version
+        self.x_axis = x_axis
+        self.y_axis = y_axis
+        self.framebuffer = FRAMEBUFFERS[self.framebuffer_type](x_axis, y_axis)
+        self.framebuffer.wrap = wrap
+        self.framebuffer.version = version
+        self.framebuffer._mark_all()
+
+    def set_pixel(self, x: int, y: int) -> bool:
+        return self.framebuffer.set_pixel(x, y)
+
+    def draw_sprite(self, x: int, y: int, sprite: bytes) -> bool:
+        """XOR a sprite (one byte per row, 8 pixels wide) into the framebuffer at (x, y).
+        Returns True if any lit pixel was switched off (VF collision).
+        """
+        return self.framebuffer.draw_sprite(x, y, sprite)
+
+    def clear_screen(self) -> None:
+        self.framebuffer.clear()
+
+    # Window lifecycle
+    def open(self, title: str, fps: int) -> None:
+        pass
+
+    def should_close(self) -> bool:
+        return False
+
+    def begin_frame(self) -> None:
+        pass
+
+    def end_frame(self) -> None:
+        pass
+
+    def poll(self) -> None:
+        """Stand-in for begin_frame()/end_frame() on a frame that is not drawn, keeps the window responsive."""
+        pass
+
+    def wait_frame(self) -> None:
+        """Sleep until the next frame is due. end_frame() does not wait, so the time spent
+        drawing and the time spent pacing can be measured apart.
+        """
+        pass
+
+    def close(self) -> None:
+        pass
+
+    # Rendering
+    def render(self) -> None:
+        pass
+
+    def render_info(self, core: object) -> None:
+        pass
+
+    def render_opcode_history(self, core: object) -> None:
+        pass
+
+    def render_performance(self, lines: list) -> None:
+        """Performance HUD, see core.scheduler.FrameMonitor.hud()."""
+        pass
+
+    def render_selection(self, roms: list, str_len: int, row: int, col: int) -> None:
+        pass
+
+    def render_exception(self, message: str) -> None:
+        pass
+
+
+class BaseKeyboard:
+    """What Core and the main loop need from a key input backend.
+    Backends fill `keys` in update_key_state(), one slot per key value.
+    """
+
+    def __init__(self) -> None:
+        self.keys: bytearray = bytearray(KEY_COUNT)
+        self.just_pressed: bytearray = bytearray(KEY_COUNT)
+
+    def is_pressed(self, key_value: int) -> bool:
+        return self.keys[key_value]
+
+    def is_just_pressed(self, key_value: int) -> bool:
+        """Returns True if the key was just pressed this frame."""
+        return self.just_pressed[key_value]
+
+    def update_key_state(self) -> None:
+        pass
+
+    def get_held_down_value(self) -> int | None:
+        """Returns the value of the first keypad key held down, or None."""
+        for key_value in range(16):
+            if self.keys[key_value]:
+                return key_value
+        return None
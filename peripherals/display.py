@@ -1,14 +1,62 @@
-from pyray import draw_rectangle, draw_text, YELLOW, Rectangle, draw_rectangle_lines_ex
+from pyray import (
+    draw_rectangle,
+    draw_text,
+    draw_texture,
+    draw_texture_pro,
+    draw_texture_rec,
+    begin_texture_mode,
+    end_texture_mode,
+    clear_background,
+    load_render_texture,
+    unload_render_texture,
+    get_screen_width,
+    get_screen_height,
+    gen_image_color,
+    image_text,
+    measure_text,
+    load_texture_from_image,
+    unload_image,
+    unload_texture,
+    update_texture,
+    ffi,
+    Rectangle,
+    Vector2,
+    draw_rectangle_lines_ex,
+    init_window,
+    set_target_fps,
+    window_should_close,
+    begin_drawing,
+    end_drawing,
+    poll_input_events,
+    close_window,
+    BLACK,
+    BLANK,
+    RED,
+    WHITE,
+    YELLOW,
+)
+import time
+from collections import OrderedDict
+
 import numpy as np
 
-class Display:
+from .base import BaseDisplay
+
+_NOT_DRAWN = object() # key of a layer that has not been drawn yet
+_HEX2 = [f"{value:02X}" for value in range(256)]
+
+class Display(BaseDisplay):
+    """raylib window backend."""
+    WINDOW_W: int = 644
+    WINDOW_H: int = 720
+    _TIMER_LABELS = ("PC: ", "I:    ", "DT: ", "ST: ", "SP: ")
+    MAX_TEXT_TEXTURES: int = 1024 # cached value textures, least recently drawn are dropped first
+
     # TODO: Make the resolution adjust base on window size
-    def __init__(self, x_axis: int, y_axis: int, aspect_ratio: int, color: tuple):
+    def __init__(self, x_axis: int, y_axis: int, aspect_ratio: int, color: tuple, framebuffer: str = "array"):
+        super().__init__(x_axis, y_axis, framebuffer)
         self.s_ratio = aspect_ratio
         self.color: tuple = color
-        self.x_axis: int  = x_axis
-        self.y_axis: int = y_axis
-        self.pixels: np.ndarray = np.zeros((x_axis, y_axis), dtype=bool)
         self.keys = {
             0X1:   1, 0X2:   2, 0X3:   3, 0XC: "4",
             0X4: "Q", 0X5: "W", 0X6: "E", 0XD: "R",
@@ -16,76 +64,236 @@ class Display:
             0XA: "Z", 0X0: "X", 0XB: "C", 0XF: "V"
         }
 
-    def set_pixel(self, x: int, y: int) -> None:
-      x = (x % self.x_axis)
-      y = y % self.y_axis
-      
-      collision = self.pixels[x, y]
-      self.pixels[x,  y] = not self.pixels[x, y]
-      return collision and not self.pixels[x, y]
-    
-    def clear_screen(self):
-        self.pixels.fill(False)
+        # Texture rendering, the framebuffer is uploaded to one texture and drawn scaled.
+        self.use_texture: bool = True # False draws one rectangle per lit pixel
+        self._texture: object = None
+        self._texture_size: tuple = (0, 0)
+        self._rgba: np.ndarray | None = None
+        self._uploaded_version: int | None = None
+
+        # UI layers, drawn once into render textures and redrawn only when their key changes.
+        self.use_layers: bool = True # False draws every UI element every frame
+        self._layers: dict = {} # name -> [render texture, key it was drawn with]
+        self._text_textures: OrderedDict = OrderedDict() # (text, fontsize, color) -> texture
+        self._label_widths: dict = {} # (label, fontsize) -> pixels up to the value after it
+
+        # Window layout
+        self._core_frame = Rectangle(1, 1, 642, 362)
+        self._info_frame = Rectangle(1, 364, 642, 355)
+
+        # Frame pacing, see wait_frame()
+        self._frame_time: float = 1 / 60
+        self._next_frame: float = 0.0
+
+    def open(self, title: str, fps: int) -> None:
+        init_window(self.WINDOW_W, self.WINDOW_H, title)
+        # no waiting inside end_drawing(), frames are paced by wait_frame()
+        set_target_fps(0)
+        self._frame_time = 1 / fps
+        self._next_frame = time.perf_counter()
+
+    def should_close(self) -> bool:
+        return window_should_close()
+
+    def begin_frame(self) -> None:
+        begin_drawing()
+        clear_background(BLACK)
+        draw_rectangle_lines_ex(self._core_frame, 1.0, self.color)
+        draw_rectangle_lines_ex(self._info_frame, 1.0, self.color)
+
+    def end_frame(self) -> None:
+        end_drawing()
+
+    def poll(self) -> None:
+        # no end_drawing, so the last drawn frame stays on screen
+        poll_input_events()
+
+    def wait_frame(self) -> None:
+        self._next_frame += self._frame_time
+        delay = self._next_frame - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            self._next_frame = time.perf_counter()
+
+    def close(self) -> None:
+        self.unload()
+        close_window()
+
+    def render_exception(self, message: str) -> None:
+        draw_text("An Error Occured:", 10, 400, 20, RED)
+        draw_text(f"{message}", 10, 420, 20, RED)
+        draw_text("Pressed C to Continue", 10, 440, 20, RED)
 
     def render(self) -> None:
+        if self.use_texture:
+            self.render_texture()
+        else:
+            self.render_rectangles()
+
+    def render_texture(self) -> None:
+        """Draw the framebuffer with a single scaled texture, uploading it only when it changed."""
+        padding_x = 5
+        padding_y = 10
+        size = (self.x_axis, self.y_axis)
+        if self._texture is None or self._texture_size != size:
+            self.unload()
+            image = gen_image_color(self.x_axis, self.y_axis, BLANK) # RGBA8
+            self._texture = load_texture_from_image(image)
+            unload_image(image)
+            self._texture_size = size
+            self._rgba = np.zeros((self.y_axis, self.x_axis, 4), dtype=np.uint8)
+
+        if self.framebuffer.version != self._uploaded_version:
+            self._rgba.fill(0)
+            self._rgba[self.pixels] = self.color
+            update_texture(self._texture, ffi.from_buffer(self._rgba))
+            self._uploaded_version = self.framebuffer.version
+
+        draw_texture_pro(
+            self._texture,
+            Rectangle(0, 0, self.x_axis, self.y_axis),
+            Rectangle(padding_x, padding_y, self.x_axis * self.s_ratio, self.y_axis * self.s_ratio),
+            Vector2(0, 0),
+            0.0,
+            WHITE
+        )
+
+    def unload(self) -> None:
+        """Release the framebuffer texture and UI layers, call before close_window()."""
+        if self._texture is not None:
+            unload_texture(self._texture)
+            self._texture = None
+            self._uploaded_version = None
+        for render_texture, _ in self._layers.values():
+            unload_render_texture(render_texture)
+        self._layers.clear()
+        for texture in self._text_textures.values():
+            unload_texture(texture)
+        self._text_textures.clear()
+
+    def _render_layer(self, name: str, key: object, draw: object, *args) -> None:
+        """Draw through the cached layer `name`, calling draw(*args) again only when key changed."""
+        if not self.use_layers:
+            draw(*args)
+            return
+        layer = self._layers.get(name)
+        if layer is None:
+            layer = [load_render_texture(get_screen_width(), get_screen_height()), _NOT_DRAWN]
+            self._layers[name] = layer
+        if layer[1] != key:
+            begin_texture_mode(layer[0])
+            clear_background(BLANK)
+            draw(*args)
+            end_texture_mode()
+            layer[1] = key
+        texture = layer[0].texture
+        # render textures are stored upside down
+        draw_texture_rec(texture, Rectangle(0, 0, texture.width, -texture.height), Vector2(0, 0), WHITE)
+
+    def _draw_text_cached(self, text: str, x: int, y: int, fontsize: int, color: tuple) -> None:
+        """draw_text through a texture cached per (text, fontsize, color), for values that
+        change but repeat, like register contents: one blit instead of laying out every glyph.
+        """
+        if not self.use_layers:
+            draw_text(text, x, y, fontsize, color)
+            return
+        key = (text, fontsize, color)
+        texture = self._text_textures.get(key)
+        if texture is None:
+            image = image_text(text, fontsize, color)
+            texture = load_texture_from_image(image)
+            unload_image(image)
+            self._text_textures[key] = texture
+            if len(self._text_textures) > self.MAX_TEXT_TEXTURES:
+                unload_texture(self._text_textures.popitem(last=False)[1])
+        else:
+            self._text_textures.move_to_end(key)
+        draw_texture(texture, x, y, WHITE)
+
+    def _label_width(self, label: str, fontsize: int) -> int:
+        """Offset of the text following `label`, where draw_text(label + text) would put it."""
+        width = self._label_widths.get((label, fontsize))
+        if width is None:
+            # measure_text leaves out the spacing after the last character
+            width = measure_text(label, fontsize) + fontsize // 10
+            self._label_widths[(label, fontsize)] = width
+        return width
+
+    def render_rectangles(self) -> None:
         padding_x = 5
         padding_y = 10
-        for x in range(self.x_axis):
-            for y in range(self.y_axis):
-                if self.pixels[x, y]:
-                    draw_rectangle(
-                        x * self.s_ratio  + padding_x, 
-                        y * self.s_ratio + padding_y, 
-                        self.s_ratio, 
-                        self.s_ratio, 
-                        self.color
-                    )
+        for x, y in self.framebuffer.lit_pixels():
+            draw_rectangle(
+                x * self.s_ratio  + padding_x, 
+                y * self.s_ratio + padding_y, 
+                self.s_ratio, 
+                self.s_ratio, 
+                self.color
+            )
     
     def render_info(self, core: object) -> None:
+        # labels come from the static layer, values from textures cached per value,
+        # so a frame only rasterises the values it has not shown recently
+        self._render_layer("info_static", self.color, self._draw_info_static)
+        self._draw_info(core)
+
+    def render_performance(self, lines: list) -> None:
+        # the lines only change a couple of times a second, so the list is its own key
+        self._render_layer("performance", tuple(lines), self._draw_performance, lines)
+
+    def _draw_performance(self, lines: list) -> None:
+        # one row in the free strip under the game screen, the info panel is full
+        draw_text("  ".join(lines), 10, self.y_axis * self.s_ratio + 18, 12, self.color)
+
+    def _draw_info(self, core: object) -> None:
         y_pos = self.y_axis * self.s_ratio + 50
-        x_pos = 5
         fontsize = 16
+        color = self.color
+        text = self._draw_text_cached
+        v = core._v
         for i in range(16):
-            if i == 1:
-                draw_text(f"V{i:X}:  {core._v[i]:02X}", x_pos, y_pos + i * 20, fontsize, self.color)
-                continue
-            draw_text(f"V{i:X}: {core._v[i]:02X}", x_pos, y_pos + i * 20, fontsize, self.color)
+            text(_HEX2[v[i]], 5 + self._label_width(self._register_label(i), fontsize), y_pos + i * 20, fontsize, color)
 
         x_pos = 80
         text_y_pos = y_pos + 240
-        draw_text(f"PC: {core._pc:04X}", x_pos, text_y_pos, fontsize, self.color)
-        draw_text(f"I:    {core._i:04X}", x_pos, text_y_pos + 20, fontsize, self.color)
-        draw_text(f"DT: {core._dt:02X}", x_pos, text_y_pos + 40, fontsize, self.color)
-        draw_text(f"ST: {core._st:02X}", x_pos, text_y_pos + 60, fontsize, self.color)
-        draw_text(f"SP: {core._sp:02X}", x_pos, text_y_pos + 80, fontsize, self.color)
-
+        values = (f"{core._pc:04X}", f"{core._i:04X}", _HEX2[core._dt], _HEX2[core._st], _HEX2[core._sp])
+        for row, (label, value) in enumerate(zip(self._TIMER_LABELS, values)):
+            text(value, x_pos + self._label_width(label, fontsize), text_y_pos + row * 20, fontsize, color)
 
         x_pos = 180
-        draw_text("Esc: Exit Emulator", x_pos + 120, y_pos, fontsize, self.color)
-        draw_text("Key 5: Reselect Game", x_pos + 120, y_pos + 20, fontsize, self.color)
+        stack = core._stack
         for row in range(16):
             if row == core._sp:
-                draw_text(
-                    f">S{row:02X}: {core._stack[core._sp]:04X}", 
-                    x_pos , 
-                    (y_pos + (20 * row)), 
-                    fontsize, 
-                    YELLOW
-                )
+                text(f">S{row:02X}: {stack[row]:04X}", x_pos, y_pos + 20 * row, fontsize, YELLOW)
                 continue
-            draw_text(
-                f" S{row:02X}: {core._stack[row]:03X}", 
-                x_pos , 
-                (y_pos + (20 * row)), 
-                fontsize, 
-                self.color
-            )
-        
-        self.render_key_info()
+            text(f" S{row:02X}: {stack[row]:03X}", x_pos, y_pos + 20 * row, fontsize, color)
 
+    @staticmethod
+    def _register_label(i: int) -> str:
+        # V1 gets an extra space, 1 is narrower than the other digits
+        return f"V{i:X}:  " if i == 1 else f"V{i:X}: "
 
+    def _draw_info_static(self) -> None:
+        y_pos = self.y_axis * self.s_ratio + 50
+        x_pos = 180
+        fontsize = 16
+        for i in range(16):
+            draw_text(self._register_label(i), 5, y_pos + i * 20, fontsize, self.color)
+        for row, label in enumerate(self._TIMER_LABELS):
+            draw_text(label, 80, y_pos + 240 + row * 20, fontsize, self.color)
+        draw_text("Esc: Exit Emulator", x_pos + 120, y_pos, fontsize, self.color)
+        draw_text("Key 5: Reselect Game", x_pos + 120, y_pos + 20, fontsize, self.color)
+        draw_text("F6/F9: Save/Load", x_pos + 310, y_pos, fontsize, self.color)
+        draw_text("F7: Next Slot", x_pos + 310, y_pos + 20, fontsize, self.color)
+        draw_text("Hold Backspace: Rewind", x_pos + 120, y_pos + 334, fontsize, self.color)
+        draw_text("Hold Tab: Turbo", x_pos + 330, y_pos + 334, fontsize, self.color)
+        self._draw_key_info()
 
     def render_key_info(self) -> None:
+        self._render_layer("keys", self.color, self._draw_key_info)
+
+    def _draw_key_info(self) -> None:
         y_pos = self.y_axis * self.s_ratio + 50
         x_pos = 185
         pos = 0
@@ -111,22 +319,29 @@ class Display:
                 pos += 1
     
     def render_opcode_history(self, core: object) -> None:
+        if core.history is None:
+            return
+        # changes nearly every frame, so no layer, but each line is a cached value texture
         y_pos = self.y_axis * self.s_ratio + 50
         x_pos = 70
-        history = core._opcode_history
-        for i, opcode in enumerate(history):
+        text = self._draw_text_cached
+        history = core.history.latest(10)
+        for i, (opcode, _) in enumerate(history):
             text_y_pos = y_pos + i * 20
             if i == 0:
-                draw_text(f"> {opcode:04X}", x_pos, text_y_pos, 20, YELLOW)
+                text(f"> {opcode:04X}", x_pos, text_y_pos, 20, YELLOW)
                 continue
-            draw_text(f"  {opcode:04X}", x_pos, text_y_pos + 20, 16, self.color)
+            text(f"  {opcode:04X}", x_pos, text_y_pos + 20, 16, self.color)
 
     def render_selection(self, roms: list, str_len: int, row: int, col: int) -> None:
+        key = (id(roms), str_len, row, col)
+        self._render_layer("selection", key, self._draw_selection, roms, str_len, row, col)
+        self._render_layer("selection_static", self.color, self._draw_selection_static)
+
+    def _draw_selection(self, roms: list, str_len: int, row: int, col: int) -> None:
         starting_x = 5
         row_height = 20
         column_width = 90
-        text_x_pos = 50
-        text_y_pos = self.y_axis * self.s_ratio + 70
         for y in range(0, len(roms)):
             rom_value = roms[y]
             for x in range(0, len(rom_value)):
@@ -136,7 +351,10 @@ class Display:
                     draw_text(f">{rom_value[x]}", x_pos, y_pos, 14, YELLOW)
                     continue
                 draw_text(f" {rom_value[x]}", x_pos, y_pos, 14, self.color)
-        
+
+    def _draw_selection_static(self) -> None:
+        text_x_pos = 50
+        text_y_pos = self.y_axis * self.s_ratio + 70
         draw_text("CHIP 8 Emulator", 320, text_y_pos - 20, 30, self.color)
         draw_text("UP:       W", text_x_pos, text_y_pos + 30, 20, self.color)
         draw_text("DOWN:   S", text_x_pos, text_y_pos + 60, 20, self.color)
@@ -144,6 +362,6 @@ class Display:
         draw_text("RIGHT:  D", text_x_pos, text_y_pos + 120, 20, self.color)
         draw_text("PlAY:    C", text_x_pos, text_y_pos + 150, 20, self.color)
         draw_text("ESC: Exit Emulator", text_x_pos, text_y_pos + 280, 20, self.color)
-        self.render_key_info()
+        self._draw_key_info()
 
 
@@ -0,0 +1,225 @@
+import numpy as np
+
+# SPRITE_BITS[byte] is the 8 pixel row drawn by a sprite byte, most significant bit first.
+SPRITE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).astype(bool)
+
+
+class Framebuffer:
+    """Change tracking shared by the framebuffer backends.
+
+    `version` goes up on every change and never resets, so any number of consumers
+    can remember the last version they saw. The dirty rows / rect accumulate until
+    someone calls take_dirty().
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width: int = width
+        self.height: int = height
+        self.wrap: bool = True # sprites wrap around the screen edges, False clips them
+        self.version: int = 0
+        self.dirty_rows: set = set()
+        self.dirty_rect: tuple | None = None # (x0, y0, x1, y1), end exclusive
+
+    def take_dirty(self) -> tuple:
+        """Returns (sorted dirty rows, dirty rect or None) and resets both."""
+        dirty = (sorted(self.dirty_rows), self.dirty_rect)
+        self.dirty_rows = set()
+        self.dirty_rect = None
+        return dirty
+
+    def _mark(self, x0: int, y0: int, x1: int, y1: int, rows: object) -> None:
+        self.version += 1
+        self.dirty_rows.update(rows)
+        rect = self.dirty_rect
+        if rect is not None:
+            x0 = min(x0, rect[0])
+            y0 = min(y0, rect[1])
+            x1 = max(x1, rect[2])
+            y1 = max(y1, rect[3])
+        self.dirty_rect = (x0, y0, x1, y1)
+
+    def _mark_all(self) -> None:
+        self._mark(0, 0, self.width, self.height, range(self.height))
+
+    def _mark_sprite(self, x: int, y: int, height: int) -> None:
+        """Mark the area touched by an 8 pixel wide sprite at the already wrapped (x, y)."""
+        if x + 8 <= self.width:
+            x0, x1 = x, x + 8
+        elif self.wrap:
+            x0, x1 = 0, self.width
+        else:
+            x0, x1 = x, self.width
+
+        if y + height <= self.height:
+            self._mark(x0, y, x1, y + height, range(y, y + height))
+        elif self.wrap:
+            rows = [row % self.height for row in range(y, y + height)]
+            self._mark(x0, 0, x1, self.height, rows)
+        else:
+            self._mark(x0, y, x1, self.height, range(y, self.height))
+
+
+class ArrayFramebuffer(Framebuffer):
+    """One bool per pixel in a row-major (height, width) NumPy array."""
+
+    def __init__(self, width: int, height: int) -> None:
+        super().__init__(width, height)
+        self.pixels: np.ndarray = np.zeros((height, width), dtype=bool) # pixels[y, x]
+
+    def clear(self) -> None:
+        self.pixels.fill(False)
+        self._mark_all()
+
+    def set_pixel(self, x: int, y: int) -> bool:
+        x = x % self.width
+        y = y % self.height
+        collision = self.pixels[y, x]
+        self.pixels[y, x] = not collision
+        self._mark(x, y, x + 1, y + 1, (y,))
+        return bool(collision)
+
+    def draw_sprite(self, x: int, y: int, sprite: bytes) -> bool:
+        x = x % self.width
+        y = y % self.height
+        if not any(sprite):
+            return False
+        self._mark_sprite(x, y, len(sprite))
+        rows = SPRITE_BITS[list(sprite)]
+        height, width = rows.shape
+        if y + height <= self.height and x + width <= self.width:
+            region = (slice(y, y + height), slice(x, x + width))
+        elif self.wrap:
+            region = np.ix_(np.arange(y, y + height) % self.height, np.arange(x, x + width) % self.width)
+        else:
+            rows = rows[:self.height - y, :self.width - x]
+            region = (slice(y, y + rows.shape[0]), slice(x, x + rows.shape[1]))
+
+        target = self.pixels[region]
+        collision = bool((target & rows).any())
+        self.pixels[region] = target ^ rows
+        return collision
+
+    def lit_pixels(self) -> list:
+        """(x, y) of every lit pixel."""
+        ys, xs = np.nonzero(self.pixels)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def to_array(self) -> np.ndarray:
+        return self.pixels
+
+    def tobytes(self) -> bytes:
+        """Rows packed 8 pixels per byte, leftmost pixel in the most significant bit."""
+        return np.packbits(self.pixels, axis=1).tobytes()
+
+    def frombytes(self, data: bytes) -> None:
+        """Inverse of tobytes()."""
+        packed = np.frombuffer(data, dtype=np.uint8).reshape(self.height, -1)
+        self.pixels[:] = np.unpackbits(packed, axis=1)[:, :self.width]
+        self._mark_all()
+
+    def copy(self) -> "ArrayFramebuffer":
+        other = ArrayFramebuffer(self.width, self.height)
+        other.wrap = self.wrap
+        other.pixels[:] = self.pixels
+        return other
+
+
+class PackedFramebuffer(Framebuffer):
+    """Each row is one Python int, leftmost pixel in the most significant of `width` bits.
+    A sprite row becomes a shift plus XOR and collision an AND test, at any width.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        super().__init__(width, height)
+        self.rows: list = [0] * height
+        self._mask: int = (1 << width) - 1
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """Unpacked (height, width) bool copy, for code that wants an array."""
+        return self.to_array()
+
+    def clear(self) -> None:
+        self.rows = [0] * self.height
+        self._mark_all()
+
+    def set_pixel(self, x: int, y: int) -> bool:
+        x = x % self.width
+        y = y % self.height
+        bit = 1 << (self.width - 1 - x)
+        row = self.rows[y]
+        self.rows[y] = row ^ bit
+        self._mark(x, y, x + 1, y + 1, (y,))
+        return bool(row & bit)
+
+    def draw_sprite(self, x: int, y: int, sprite: bytes) -> bool:
+        width = self.width
+        height = self.height
+        mask = self._mask
+        rows = self.rows
+        x = x % width
+        y = y % height
+        if not any(sprite):
+            return False
+        self._mark_sprite(x, y, len(sprite))
+        wrap = self.wrap
+        collision = 0
+        for offset, byte in enumerate(sprite):
+            row_y = y + offset
+            if row_y >= height:
+                if not wrap:
+                    break
+                row_y %= height
+            bits = byte << (width - 8)
+            if wrap:
+                bits = (bits >> x | bits << (width - x)) & mask
+            else:
+                bits >>= x
+            row = rows[row_y]
+            collision |= row & bits
+            rows[row_y] = row ^ bits
+        return collision != 0
+
+    def lit_pixels(self) -> list:
+        """(x, y) of every lit pixel."""
+        lit = []
+        top = self.width - 1
+        for y, row in enumerate(self.rows):
+            while row:
+                bit = row.bit_length() - 1
+                lit.append((top - bit, y))
+                row ^= 1 << bit
+        return lit
+
+    def to_array(self) -> np.ndarray:
+        return np.unpackbits(
+            np.frombuffer(self.tobytes(), dtype=np.uint8).reshape(self.height, -1), axis=1
+        )[:, :self.width].astype(bool)
+
+    def tobytes(self) -> bytes:
+        """Rows packed 8 pixels per byte, leftmost pixel in the most significant bit."""
+        row_bytes = (self.width + 7) // 8
+        pad = row_bytes * 8 - self.width
+        return b"".join((row << pad).to_bytes(row_bytes, "big") for row in self.rows)
+
+    def frombytes(self, data: bytes) -> None:
+        """Inverse of tobytes()."""
+        row_bytes = (self.width + 7) // 8
+        pad = row_bytes * 8 - self.width
+        self.rows = [
+            int.from_bytes(data[start:start + row_bytes], "big") >> pad
+            for start in range(0, self.height * row_bytes, row_bytes)
+        ]
+        self._mark_all()
+
+    def copy(self) -> "PackedFramebuffer":
+        other = PackedFramebuffer(self.width, self.height)
+        other.wrap = self.wrap
+        other.rows = self.rows.copy()
+        return other
+
+
+FRAMEBUFFERS = {
+    "array": ArrayFramebuffer,
+    "packed": PackedFramebuffer,
+}
@@ -5,8 +5,10 @@ from pyray import (
     KeyboardKey
 )
 
+from .base import BaseKeyboard, KEY_COUNT
 
-class Keyboard:
+
+class Keyboard(BaseKeyboard):
     def __init__(self) -> None:
         """
             Layout:
@@ -18,10 +20,11 @@ class Keyboard:
             ---------------------------------
             Z: 0XA | X: 0X0 | C: 0XB | V: 0XF 
         """
-        self.keys: np = np.array([False] * 19, dtype=np.uint8)
+        super().__init__()
+        self.keys: np = np.array([False] * KEY_COUNT, dtype=np.uint8)
         self.previous_keys = self.keys.copy()
         self.just_pressed = self.keys.copy()
-        self.last_press_time = {key: 0.0 for key in range(19)}
+        self.last_press_time = {key: 0.0 for key in range(KEY_COUNT)}
         self.press_delay = 0.2  # 200 milliseconds
         self.key_map = {
             KeyboardKey.KEY_ONE: 0x1,
@@ -43,6 +46,13 @@ class Keyboard:
             KeyboardKey.KEY_FIVE: 0X10,
             KeyboardKey.KEY_B: 0X11,
 
+            # SAVE STATES
+            KeyboardKey.KEY_F6: 0X13,
+            KeyboardKey.KEY_F9: 0X14,
+            KeyboardKey.KEY_F7: 0X15,
+            KeyboardKey.KEY_BACKSPACE: 0X16,
+            KeyboardKey.KEY_TAB: 0X17,
+
             # DEBUG KEY
             KeyboardKey.KEY_LEFT_SHIFT: 0X12
         }
@@ -0,0 +1,24 @@
+from .base import BaseDisplay, BaseKeyboard, KEY_COUNT
+
+
+class NullDisplay(BaseDisplay):
+    """Display without a window: keeps the framebuffer, every render call is a no-op."""
+
+    def __init__(self, x_axis: int = 64, y_axis: int = 32, framebuffer: str = "array") -> None:
+        super().__init__(x_axis, y_axis, framebuffer)
+
+
+class NullKeyboard(BaseKeyboard):
+    """Keyboard without physical input, keys only change through press() / release()."""
+
+    def press(self, key_value: int) -> None:
+        if not self.keys[key_value]:
+            self.just_pressed[key_value] = 1
+        self.keys[key_value] = 1
+
+    def release(self, key_value: int) -> None:
+        self.keys[key_value] = 0
+
+    def update_key_state(self) -> None:
+        """Just pressed only lasts for one frame."""
+        self.just_pressed = bytearray(KEY_COUNT)
@@ -0,0 +1,162 @@
+import curses
+import time
+
+from .base import BaseDisplay, BaseKeyboard, KEY_COUNT
+
+# Two framebuffer rows per text row: (top, bottom) -> character
+_HALF_BLOCKS = {
+    (False, False): " ",
+    (True, False): "▀",
+    (False, True): "▄",
+    (True, True): "█",
+}
+
+
+class TerminalDisplay(BaseDisplay):
+    """curses backend, draws the framebuffer with half block characters."""
+
+    def __init__(self, x_axis: int, y_axis: int, framebuffer: str = "array") -> None:
+        super().__init__(x_axis, y_axis, framebuffer)
+        self.screen: object = None
+        self.closing: bool = False # set by TerminalKeyboard when Esc is pressed
+        self._frame_time: float = 0.0
+        self._next_frame: float = 0.0
+
+    def open(self, title: str, fps: int) -> None:
+        self.screen = curses.initscr()
+        curses.noecho()
+        curses.cbreak()
+        self.screen.nodelay(True)
+        self.screen.keypad(True)
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        self._frame_time = 1 / fps
+        self._next_frame = time.perf_counter()
+        self._title = title
+
+    def should_close(self) -> bool:
+        return self.closing
+
+    def begin_frame(self) -> None:
+        self.screen.erase()
+
+    def end_frame(self) -> None:
+        self.screen.refresh()
+
+    def wait_frame(self) -> None:
+        self._next_frame += self._frame_time
+        delay = self._next_frame - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            self._next_frame = time.perf_counter()
+
+    def close(self) -> None:
+        if self.screen is None:
+            return
+        self.screen.keypad(False)
+        curses.nocbreak()
+        curses.echo()
+        curses.endwin()
+        self.screen = None
+
+    def _put(self, y: int, x: int, text: str) -> None:
+        try:
+            self.screen.addstr(y, x, text)
+        except curses.error:
+            # terminal too small, clip
+            pass
+
+    def render(self) -> None:
+        pixels = self.pixels.tolist()
+        blank = [False] * self.x_axis
+        for row in range(0, self.y_axis, 2):
+            top = pixels[row]
+            bottom = pixels[row + 1] if row + 1 < self.y_axis else blank
+            self._put(row // 2, 0, "".join(_HALF_BLOCKS[pair] for pair in zip(top, bottom)))
+
+    def render_info(self, core: object) -> None:
+        y_pos = (self.y_axis + 1) // 2 + 1
+        registers = " ".join(f"{value:02X}" for value in core._v)
+        self._put(y_pos, 0, f"PC: {core._pc:04X}  I: {core._i:04X}  DT: {core._dt:02X}  ST: {core._st:02X}  SP: {core._sp:02X}")
+        self._put(y_pos + 1, 0, f"V0-VF: {registers}")
+        self._put(y_pos + 2, 0, "Esc: Exit Emulator  5: Reselect Game  P: Pause")
+        self._put(y_pos + 3, 0, "K/L: Save/Load State  O: Next Slot  U: Rewind  T: Turbo")
+
+    def render_opcode_history(self, core: object) -> None:
+        if core.history is None:
+            return
+        x_pos = self.x_axis + 2
+        for i, (opcode, pc) in enumerate(core.history.latest(10)):
+            marker = ">" if i == 0 else " "
+            self._put(i, x_pos, f"{marker} {pc:03X}: {opcode:04X}")
+
+    def render_performance(self, lines: list) -> None:
+        y_pos = (self.y_axis + 1) // 2 + 1
+        self._put(y_pos + 4, 0, "  ".join(lines))
+
+    def render_selection(self, roms: list, str_len: int, row: int, col: int) -> None:
+        self._put(0, 0, "CHIP 8 Emulator  W/A/S/D: Move  C: Play  Esc: Exit")
+        for y, rom_value in enumerate(roms):
+            for x, name in enumerate(rom_value):
+                marker = ">" if y == col and x == row else " "
+                self._put(y + 2, x * (str_len + 2), f"{marker}{name}")
+
+    def render_exception(self, message: str) -> None:
+        y_pos = (self.y_axis + 1) // 2 + 1
+        self._put(y_pos + 4, 0, "An Error Occured:")
+        self._put(y_pos + 5, 0, message)
+        self._put(y_pos + 6, 0, "Pressed C to Continue")
+
+
+class TerminalKeyboard(BaseKeyboard):
+    """Key input from the TerminalDisplay's curses screen.
+    Terminals only report presses, so a key counts as held for HOLD_TIME after its last press.
+    """
+    HOLD_TIME: float = 0.15
+    ESCAPE: int = 27
+
+    def __init__(self, display: TerminalDisplay) -> None:
+        super().__init__()
+        self.display: TerminalDisplay = display
+        self.key_map = {
+            "1": 0x1, "2": 0x2, "3": 0x3, "4": 0xc,
+            "q": 0x4, "w": 0x5, "e": 0x6, "r": 0xd,
+            "a": 0x7, "s": 0x8, "d": 0x9, "f": 0xe,
+            "z": 0xa, "x": 0x0, "c": 0xb, "v": 0xf,
+            "5": 0x10,
+            "b": 0x11,
+
+            # SAVE STATES
+            "k": 0x13,
+            "l": 0x14,
+            "o": 0x15,
+            "u": 0x16,
+            "t": 0x17,
+
+            # DEBUG KEY
+            "p": 0x12,
+        }
+        self._last_seen = [float("-inf")] * KEY_COUNT
+
+    def update_key_state(self) -> None:
+        screen = self.display.screen
+        now = time.perf_counter()
+        if screen is not None:
+            while True:
+                char = screen.getch()
+                if char == -1:
+                    break
+                if char == self.ESCAPE:
+                    self.display.closing = True
+                    continue
+                if 0 <= char < 256:
+                    key_value = self.key_map.get(chr(char).lower())
+                    if key_value is not None:
+                        self._last_seen[key_value] = now
+
+        previous = self.keys
+        self.keys = bytearray(now - seen < self.HOLD_TIME for seen in self._last_seen)
+        self.just_pressed = bytearray(key and not was for key, was in zip(self.keys, previous))
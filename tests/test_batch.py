@@ -0,0 +1,20 @@
+from core.batch import BatchCore
+
+
+def test_pc_past_memory_fails_instead_of_raising():
+    batch = BatchCore(1)
+    batch.load_rom(bytes.fromhex("1FFF")) # jump to the last byte, no room for an opcode
+    assert batch.step() == 1
+    assert batch.step() == 0
+    assert batch.failed[0]
+    assert "PC out of memory" in batch.exceptions[0]
+    assert batch.step() == 0
+
+
+def test_out_of_memory_machine_does_not_stop_the_others():
+    batch = BatchCore(2)
+    batch.load_rom(bytes.fromhex("1FFF"), instances=slice(0, 1))
+    batch.load_rom(bytes.fromhex("7001 1200"), instances=slice(1, 2))
+    batch.run(4)
+    assert batch.failed.tolist() == [True, False]
+    assert batch.v[1, 0] == 2
@@ -0,0 +1,12 @@
+import pytest
+
+import headless
+from core.core import ROM_SIZE
+
+
+def test_run_reports_oversized_rom(tmp_path):
+    rom = tmp_path / "BIG"
+    rom.write_bytes(bytes(ROM_SIZE + 1))
+    with pytest.raises(SystemExit) as error:
+        headless.main(["run", str(rom)])
+    assert "only 3584 fit" in str(error.value.code)
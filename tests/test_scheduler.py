@@ -0,0 +1,60 @@
+from core.scheduler import FrameMonitor
+
+FRAME_TIME = 1 / 60
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def run_frame(monitor: FrameMonitor, clock: FakeClock, emulate: float, render: float) -> None:
+    """One main loop pass: emulation, drawing if due, then sleeping to the frame deadline."""
+    start = clock.now
+    monitor.start("input")
+    monitor.start("emulate")
+    clock.now += emulate
+    monitor.start("render")
+    if monitor.should_render():
+        clock.now += render
+    monitor.start("wait")
+    clock.now = max(clock.now, start + FRAME_TIME)
+    monitor.end_frame()
+
+
+def test_recovers_after_stall():
+    clock = FakeClock()
+    monitor = FrameMonitor(FRAME_TIME, clock=clock)
+    for _ in range(120):
+        run_frame(monitor, clock, 0.002, 0.003)
+    assert monitor.render_interval == 1
+
+    run_frame(monitor, clock, 1.0, 0.003)
+    for _ in range(FrameMonitor.ADJUST_EVERY):
+        run_frame(monitor, clock, 0.002, 0.003)
+    assert monitor.render_interval > 1
+
+    for _ in range(50 * 60):
+        run_frame(monitor, clock, 0.002, 0.003)
+    assert monitor.render_interval == 1
+
+
+def test_wait_is_not_render_time():
+    clock = FakeClock()
+    monitor = FrameMonitor(FRAME_TIME, clock=clock)
+    for _ in range(60):
+        run_frame(monitor, clock, 0.002, 0.003)
+    assert abs(monitor.average("render") - 0.003) < 1e-9
+    assert monitor.average("wait") > 0.01
+
+
+def test_skips_renders_when_frames_do_not_fit():
+    clock = FakeClock()
+    monitor = FrameMonitor(FRAME_TIME, clock=clock)
+    for _ in range(240):
+        run_frame(monitor, clock, 0.006, 0.016)
+    assert monitor.render_interval > 1
+    assert monitor.dropped_frames > 0